@@ -1 +1,10 @@
 from .notutils import *
+from . import notutils as _notutils
+
+
+def __getattr__(name):
+    # the IPython and widget names are loaded on first use, so they are
+    # available as attributes but no longer brought in by ``import *``.
+    if name in _notutils._IPYTHON_NAMES:
+        return getattr(_notutils, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
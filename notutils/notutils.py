@@ -1,15 +1,564 @@
 # Copyright 2014 Open Data Science Initiative and other authors. See AUTHORS.txt
 # Licensed under the BSD 3-clause license (see LICENSE.txt)
 
+import base64
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
 import os
-from typing import Optional, Union, Callable, Dict, Any, Tuple
-import IPython
+import re
+import string
+import struct
+import threading
+import uuid
+import warnings
+import weakref
+from collections import OrderedDict
+from functools import lru_cache
+from html import escape
+from urllib.parse import urlencode
+from typing import TYPE_CHECKING, Optional, Union, Callable, Dict, Any, List, Set, Tuple
 
-if int(IPython.__version__[0]) > 3:
-    from ipywidgets import interact, fixed
-else:
-    from IPython.html.widgets.interaction import interact, fixed
-from IPython.display import display, HTML, IFrame, Image, SVG
+__all__ = [
+    "EventCounter",
+    "FrameCache",
+    "frame_cache",
+    "FrameStore",
+    "pack_frames",
+    "IframeTemplate",
+    "display_url",
+    "iframe_url",
+    "display_iframe_url",
+    "iter_urls",
+    "iter_iframe_urls",
+    "display_urls",
+    "display_iframe_urls",
+    "display_google_book",
+    "display_google_books",
+    "code_toggle",
+    "display_prediction",
+    "display_plots",
+]
+
+# IPython and ipywidgets are imported the first time a function needs them,
+# so that the HTML string builders can be used with the standard library only.
+_IPYTHON_NAMES = ("interact", "interactive", "fixed", "display", "HTML", "IFrame", "Image", "SVG")
+
+if TYPE_CHECKING:
+    from ipywidgets import interact, interactive, fixed
+    from IPython.display import display, HTML, IFrame, Image, SVG
+
+
+def _load_ipython() -> None:
+    """Import the IPython display and widget names into the module namespace.
+
+    Names that are already set (e.g. patched in tests) are left untouched.
+    """
+    namespace = globals()
+    if all(name in namespace for name in _IPYTHON_NAMES):
+        return
+    import IPython
+
+    if int(IPython.__version__[0]) > 3:
+        from ipywidgets import interact, interactive, fixed
+    else:
+        from IPython.html.widgets.interaction import interact, interactive, fixed
+    from IPython.display import display, HTML, IFrame, Image, SVG
+
+    loaded = locals()
+    for name in _IPYTHON_NAMES:
+        namespace.setdefault(name, loaded[name])
+
+
+def __getattr__(name: str) -> Any:
+    if name in _IPYTHON_NAMES:
+        _load_ipython()
+        return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+class EventCounter:
+    """Count the slider events processed by an interactive widget.
+
+    Pass an instance to :func:`display_prediction` or :func:`display_plots` to
+    check how many frames the kernel actually rendered, e.g. to compare
+    continuous updates with ``continuous_update=False``.
+    """
+
+    def __init__(self) -> None:
+        self.events = 0
+
+    def reset(self) -> None:
+        """Reset the event count to zero."""
+        self.events = 0
+
+    def __repr__(self) -> str:
+        return "EventCounter(events={})".format(self.events)
+
+
+class FrameCache:
+    """Least recently used cache of file contents bounded by total size.
+
+    Entries are keyed by path and checked against the file modification time,
+    so a file that changes on disk is read again. The cache may be filled from
+    background threads.
+
+    :param capacity_mb: Maximum total size of the cached files in megabytes (default 64)
+    :type capacity_mb: float
+    """
+
+    def __init__(self, capacity_mb: float = 64.0) -> None:
+        self.capacity = int(capacity_mb * 1024 * 1024)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, path: str) -> bytes:
+        """Return the contents of a file, reading it from disk if not cached.
+
+        :param path: Path of the file to read
+        :type path: str
+        :return: The file contents
+        :rtype: bytes
+        """
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        with open(path, "rb") as f:
+            data = f.read()
+        with self._lock:
+            self._store(path, mtime, data)
+        return data
+
+    def _store(self, path: str, mtime: int, data: bytes) -> None:
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self.size -= len(old[1])
+        if len(data) > self.capacity:
+            return
+        self._entries[path] = (mtime, data)
+        self.size += len(data)
+        while self.size > self.capacity:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return "FrameCache(entries={}, size={}, hits={}, misses={})".format(
+            len(self), self.size, self.hits, self.misses
+        )
+
+
+# cache shared by all display_plots widgets.
+frame_cache = FrameCache()
+
+# a packed frame store starts with the magic bytes and the length of the
+# JSON table of (offset, length) pairs that follows, the offsets are
+# relative to the end of the table.
+_STORE_MAGIC = b"NUFRAME1"
+_STORE_HEADER = struct.Struct("<8sQ")
+
+
+class FrameStore:
+    """Read only, memory mapped container of the frames of a plot series.
+
+    The container is written by :func:`pack_frames` and holds every frame in
+    a single file with a table of offsets, so a frame is a slice of the
+    mapped file rather than a separate open, read and close.
+
+    :param path: Path of the packed frames
+    :type path: str
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file can't be mapped.
+                raise ValueError("{} is not a packed frame store.".format(path))
+        try:
+            magic, table_size = _STORE_HEADER.unpack_from(self._mmap)
+            if magic != _STORE_MAGIC:
+                raise ValueError("bad magic bytes")
+            start = _STORE_HEADER.size
+            self._start = start + table_size
+            if self._start > len(self._mmap):
+                raise ValueError("truncated offset table")
+            table = json.loads(self._mmap[start:self._start].decode("utf-8"))
+            self._offsets = {name: (int(offset), int(length)) for name, (offset, length) in table.items()}
+            size = len(self._mmap) - self._start
+            if any(offset + length > size for offset, length in self._offsets.values()):
+                raise ValueError("truncated frame data")
+        except (struct.error, ValueError, TypeError, AttributeError) as error:
+            self._mmap.close()
+            raise ValueError("{} is not a packed frame store: {}.".format(path, error))
+
+    @property
+    def files(self) -> set:
+        """The names of the frames in the store."""
+        return set(self._offsets)
+
+    def read(self, filename: str) -> memoryview:
+        """Return a frame as a view of the mapped file without copying it.
+
+        The view must be released, or dropped, before the store is closed.
+
+        :param filename: Name of the frame relative to the packed directory
+        :type filename: str
+        :return: The frame contents
+        :rtype: memoryview
+        """
+        offset, length = self._offsets[filename]
+        start = self._start + offset
+        return memoryview(self._mmap)[start:start + length]
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mmap.close()
+
+    def __enter__(self) -> "FrameStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __repr__(self) -> str:
+        return "FrameStore({!r}, frames={})".format(self.path, len(self))
+
+_executor = None
+
+
+def _background_executor() -> Any:
+    """Return the thread pool used for background file loading.
+
+    :return: Shared thread pool executor
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _executor
+    if _executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="notutils")
+    return _executor
+
+
+_display_pool = None
+
+
+def _display_executor() -> Any:
+    """Return the thread pool used to load the frames on screen.
+
+    It is kept apart from the background pool so a visible frame never waits
+    behind prefetching or thumbnail jobs.
+
+    :return: Shared thread pool executor
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _display_pool
+    if _display_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _display_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="notutils-display")
+    return _display_pool
+
+
+_thumbnail_pool = None
+_THUMBNAIL_WORKERS = 4
+
+
+def _thumbnail_executor() -> Any:
+    """Return the thread pool used to make thumbnails.
+
+    The first pass over a series is spread across its threads, apart from
+    the background pool so prefetches never wait behind it.
+
+    :return: Shared thread pool executor
+    :rtype: concurrent.futures.ThreadPoolExecutor
+    """
+    global _thumbnail_pool
+    if _thumbnail_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        _thumbnail_pool = ThreadPoolExecutor(
+            max_workers=_THUMBNAIL_WORKERS, thread_name_prefix="notutils-thumbnails"
+        )
+    return _thumbnail_pool
+
+
+def _filebase_pattern(filebase: str) -> Tuple[Any, list]:
+    """Compile a regular expression matching the filenames a format string produces.
+
+    :param filebase: Filename with format placeholders
+    :type filebase: str
+    :return: Compiled pattern and the names of the fields it captures
+    :rtype: tuple
+    """
+    parts = []
+    names = []
+    for literal, field, _, _ in string.Formatter().parse(filebase):
+        parts.append(re.escape(literal))
+        if field is None:
+            continue
+        if field in names:
+            parts.append("(?P={})".format(field))
+        elif field.isidentifier():
+            parts.append("(?P<{}>.+?)".format(field))
+            names.append(field)
+        else:
+            parts.append(".+?")
+    return re.compile("".join(parts)), names
+
+
+class _FrameIndex:
+    """Index of the frames of a plot series built from a single directory scan.
+
+    :param filebase: Filename with format placeholders
+    :type filebase: str
+    :param directory: Directory containing the plot files
+    :type directory: str, optional
+    :param files: Names of the frames to index instead of scanning the directory
+    :type files: iterable, optional
+    """
+
+    def __init__(
+        self, filebase: str, directory: Optional[str] = None, files: Optional[Any] = None
+    ) -> None:
+        self.filebase = filebase
+        head, tail = os.path.split(filebase)
+        prefix = head + "/" if head else ""
+        pattern, self.names = _filebase_pattern(tail)
+        self.files = set()
+        if files is None:
+            scan = os.path.join(directory or ".", head)
+            with os.scandir(scan) as entries:
+                names = [entry.name for entry in entries if entry.is_file()]
+        else:
+            names = [name[len(prefix):] for name in files if name.startswith(prefix)]
+        found = []
+        for name in names:
+            match = pattern.fullmatch(name)
+            if match is not None:
+                self.files.add(prefix + name)
+                found.append((prefix + name, match.groupdict()))
+        # fields whose every value is an integer become integers, the rest
+        # keep the text matched in the filename, so e.g. a ``{x:.1f}`` field
+        # is never formatted again.
+        self._convert: Dict[str, Callable[[str], Any]] = {}
+        for field in self.names:
+            try:
+                for _, fields in found:
+                    int(fields[field])
+                self._convert[field] = int
+            except ValueError:
+                self._convert[field] = str
+        self.values: Dict[str, Set[Any]] = {field: set() for field in self.names}
+        self._paths: Dict[Tuple[Any, ...], str] = {}
+        for filename, fields in found:
+            key = tuple(self._convert[field](fields[field]) for field in self.names)
+            for field, value in zip(self.names, key):
+                self.values[field].add(value)
+            self._paths[key] = filename
+
+    def find(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """Find the file for a set of slider values.
+
+        :param kwargs: Slider values by field name
+        :type kwargs: dict
+        :return: The filename relative to the directory, or None if there's no such file
+        :rtype: str, optional
+        """
+        try:
+            key = tuple(self._convert[field](kwargs[field]) for field in self.names)
+        except (KeyError, TypeError, ValueError):
+            return self._find_formatted(kwargs)
+        filename = self._paths.get(key)
+        if filename is None:
+            return self._find_formatted(kwargs)
+        return filename
+
+    def _find_formatted(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        # values that weren't read from the filenames, e.g. given by the caller.
+        try:
+            filename = self.filebase.format(**kwargs)
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        if filename not in self.files:
+            return None
+        return filename
+
+    def __contains__(self, filename: str) -> bool:
+        return filename in self.files
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def slider_ranges(self) -> Dict[str, Any]:
+        """Infer an ``interact`` abbreviation for each field from the files found.
+
+        Integer fields become sliders stepping by the common spacing of the
+        values, other fields become drop downs of the sorted values.
+
+        :return: Widget abbreviation by field name
+        :rtype: dict
+        """
+        _load_ipython()
+        ranges = {}
+        for name, found in self.values.items():
+            if not found:
+                continue
+            try:
+                values = sorted(found, key=float)
+            except ValueError:
+                values = sorted(found)
+            if len(values) == 1:
+                ranges[name] = fixed(values[0])
+            elif isinstance(values[0], int):
+                step = 0
+                for a, b in zip(values, values[1:]):
+                    step = math.gcd(step, b - a)
+                ranges[name] = (values[0], values[-1], step)
+            else:
+                ranges[name] = values
+        return ranges
+
+
+def pack_frames(filebase: str, output: str, directory: Optional[str] = None) -> int:
+    """Pack the frames of a plot series into a single file for ``display_plots``.
+
+    Every file matching ``filebase`` is copied into ``output`` after a table of
+    offsets. Pass the packed file to ``display_plots`` as ``store`` to read the
+    frames from it instead of from the separate files.
+
+    :param filebase: Base filename with format placeholders for indexing
+    :type filebase: str
+    :param output: Path of the packed file to write
+    :type output: str
+    :param directory: Directory containing the plot files (optional)
+    :type directory: str, optional
+    :return: The number of frames packed
+    :rtype: int
+    """
+    files = sorted(_FrameIndex(filebase, directory).files)
+    table = {}
+    offset = 0
+    for filename in files:
+        size = os.path.getsize(os.path.join(directory or ".", filename))
+        table[filename] = [offset, size]
+        offset += size
+    encoded = json.dumps(table).encode("utf-8")
+    partial = output + ".part"
+    with open(partial, "wb") as f:
+        f.write(_STORE_HEADER.pack(_STORE_MAGIC, len(encoded)))
+        f.write(encoded)
+        for filename in files:
+            with open(os.path.join(directory or ".", filename), "rb") as frame:
+                data = frame.read()
+            if len(data) != table[filename][1]:
+                raise OSError("{} changed while packing.".format(filename))
+            f.write(data)
+    os.replace(partial, output)
+    return len(files)
+
+
+def _nearest_index(options: list, value: Any) -> Optional[int]:
+    """Find the position of a value among the options of a widget.
+
+    Float slider values may not match the enumerated options exactly, so
+    numbers are matched to the nearest option.
+
+    :param options: The possible values of the widget
+    :type options: list
+    :param value: The current value
+    :return: Index of the value, or None if it isn't found
+    :rtype: int, optional
+    """
+    if value in options:
+        return options.index(value)
+    try:
+        return min(range(len(options)), key=lambda i: abs(options[i] - value))
+    except TypeError:
+        return None
+
+
+def _slider_values(widget: Any) -> list:
+    """List the values a slider, selection or fixed widget can take, in order.
+
+    :param widget: The widget built for an ``interact`` abbreviation
+    :return: The possible values of the widget
+    :rtype: list
+    """
+    if isinstance(widget, fixed):
+        return [widget.value]
+    if hasattr(widget, "_options_values"):
+        return list(widget._options_values)
+    if all(hasattr(widget, attr) for attr in ("min", "max", "step")):
+        steps = int(round((widget.max - widget.min) / widget.step))
+        return [widget.min + i * widget.step for i in range(steps + 1)]
+    if isinstance(widget.value, bool):
+        return [False, True]
+    return [widget.value]
+
+
+def _interact(
+    f: Callable,
+    continuous_update: bool = True,
+    manual: bool = False,
+    **kwargs: Any
+) -> Any:
+    """Call ``interact`` with optional rate limiting of the slider events.
+
+    :param f: The function to interact with
+    :type f: callable
+    :param continuous_update: Whether sliders send events while being dragged (default True)
+    :type continuous_update: bool
+    :param manual: Whether to only update when an update button is pressed (default False)
+    :type manual: bool
+    :param **kwargs: Widget abbreviations passed on to ``interact``
+    :return: The value returned by ``interact``
+    """
+    _load_ipython()
+    if not continuous_update:
+        for name, abbrev in kwargs.items():
+            if isinstance(abbrev, fixed):
+                continue
+            widget = interactive.widget_from_abbrev(abbrev)
+            if widget is not None and hasattr(widget, "continuous_update"):
+                widget.continuous_update = False
+                kwargs[name] = widget
+    if manual:
+        return interact.options(manual=True)(f, **kwargs)
+    return interact(f, **kwargs)
 
 
 def display_url(target: str) -> None:
@@ -20,9 +569,158 @@ def display_url(target: str) -> None:
     :param target: The URL to display
     :type target: str
     """
-    prefix = u"http://" if not target.startswith("http") else u""
-    target = prefix + target
-    display(HTML(u'<a href="{t}" target=_blank>{t}</a>'.format(t=target)))
+    _load_ipython()
+    display(HTML(_url_anchor(target)))
+
+
+def _url_anchor(target: str, text: Optional[str] = None) -> str:
+    if not target.startswith("http"):
+        target = u"http://" + target
+    return u'<a href="' + target + u'" target=_blank>' + (target if text is None else text) + u"</a>"
+
+
+# placeholders are swapped for their iframe when scrolled near or clicked,
+# the script only binds placeholders it hasn't seen so it can be repeated.
+_IFRAME_PLACEHOLDER_SCRIPT = """<script>
+(function() {
+  function load(el) {
+    if (el.parentNode) { el.outerHTML = el.getAttribute("data-iframe"); }
+  }
+  var observer = null;
+  if ("IntersectionObserver" in window) {
+    observer = new IntersectionObserver(function(entries) {
+      entries.forEach(function(entry) {
+        if (entry.isIntersecting) {
+          observer.unobserve(entry.target);
+          load(entry.target);
+        }
+      });
+    }, {rootMargin: "200px"});
+  }
+  var pending = document.querySelectorAll("div.notutils-iframe:not([data-bound])");
+  Array.prototype.forEach.call(pending, function(el) {
+    el.setAttribute("data-bound", "");
+    el.addEventListener("click", function() {
+      if (observer) { observer.unobserve(el); }
+      load(el);
+    });
+    if (observer) { observer.observe(el); }
+  });
+})();
+</script>"""
+
+_IFRAME_LOADING = (None, "lazy", "placeholder")
+
+
+def _css_length(value: Union[int, str]) -> str:
+    return "{}px".format(value) if isinstance(value, int) else str(value)
+
+
+class IframeTemplate:
+    """Iframe markup for one size and border configuration, rendered for many URLs.
+
+    The attributes are formatted once when the template is created, so
+    rendering a URL only adds the ``http://`` prefix when needed and joins
+    three strings. ``iframe_url`` keeps a template for each configuration it
+    has seen.
+
+    With ``loading="lazy"`` the browser's native lazy loading is requested.
+    With ``loading="placeholder"`` a box of the same size is shown instead and
+    replaced by the iframe when it is scrolled into view or clicked, so a
+    notebook with many embeds opens without loading them all. The script that
+    swaps the boxes isn't part of the rendered markup, add :attr:`script`
+    once to each output that holds placeholders.
+
+    :param width: The width of the iframe (default 500)
+    :type width: int
+    :param height: The height of the iframe (default 400)
+    :type height: int
+    :param scrolling: Whether or not to allow scrolling (default True)
+    :type scrolling: bool
+    :param border: Width of the border
+    :type border: int
+    :param frameborder: Width of the frameborder
+    :type frameborder: int
+    :param loading: How the iframe loads, one of None, "lazy" or "placeholder" (default None, loading immediately)
+    :type loading: str, optional
+    """
+
+    def __init__(
+        self,
+        width: int = 500,
+        height: int = 400,
+        scrolling: bool = True,
+        border: int = 0,
+        frameborder: int = 0,
+        loading: Optional[str] = None,
+    ) -> None:
+        if loading not in _IFRAME_LOADING:
+            raise ValueError(
+                "loading must be one of None, 'lazy' or 'placeholder', got {!r}".format(loading)
+            )
+        self.width = width
+        self.height = height
+        self.scrolling = scrolling
+        self.border = border
+        self.frameborder = frameborder
+        self.loading = loading
+        self._head = u'<iframe frameborder="{frameborder}" scrolling="{scrolling}" style="border:{border}px" src="'.format(
+            frameborder=frameborder, scrolling="yes" if scrolling else "no", border=border
+        )
+        self._tail = u'", width={width} height={height}{lazy}></iframe>'.format(
+            width=width, height=height, lazy=' loading="lazy"' if loading == "lazy" else ""
+        )
+        if loading == "placeholder":
+            # the iframe markup is kept, escaped, in an attribute of the box.
+            self._head = u'<div class="notutils-iframe" title="Click to load" data-iframe="' + escape(self._head)
+            self._middle = escape(self._tail) + (
+                u'" style="width:{width};height:{height};display:flex;align-items:center;'
+                u'justify-content:center;border:1px dashed #aaa;cursor:pointer;'
+                u'font-family:sans-serif;overflow:hidden">Load '
+            ).format(width=_css_length(width), height=_css_length(height))
+            self._tail = u"</div>"
+
+    @property
+    def script(self) -> str:
+        """The script that loads placeholders, empty unless ``loading="placeholder"``."""
+        return u"\n" + _IFRAME_PLACEHOLDER_SCRIPT if self.loading == "placeholder" else u""
+
+    def render(self, target: str) -> str:
+        """Produce the iframe for a URL.
+
+        :param target: The target URL
+        :type target: str
+        :return: HTML iframe string
+        :rtype: str
+        """
+        if not target.startswith("http"):
+            target = u"http://" + target
+        if self.loading == "placeholder":
+            target = escape(target)
+            return self._head + target + self._middle + target + self._tail
+        return self._head + target + self._tail
+
+    __call__ = render
+
+    def __repr__(self) -> str:
+        return (
+            "IframeTemplate(width={!r}, height={!r}, scrolling={!r}, border={!r}, "
+            "frameborder={!r}, loading={!r})"
+        ).format(
+            self.width, self.height, self.scrolling, self.border, self.frameborder, self.loading
+        )
+
+
+@lru_cache(maxsize=128)
+def _iframe_template(
+    width: int = 500,
+    height: int = 400,
+    scrolling: bool = True,
+    border: int = 0,
+    frameborder: int = 0,
+    loading: Optional[str] = None,
+) -> IframeTemplate:
+    return IframeTemplate(width, height, scrolling, border, frameborder, loading)
 
 
 def iframe_url(
@@ -31,7 +729,8 @@ def iframe_url(
     height: int = 400, 
     scrolling: bool = True, 
     border: int = 0, 
-    frameborder: int = 0
+    frameborder: int = 0,
+    loading: Optional[str] = None
 ) -> str:
     """Produce an iframe for displaying an item in HTML window.
     
@@ -47,23 +746,13 @@ def iframe_url(
     :type border: int
     :param frameborder: Width of the frameborder
     :type frameborder: int
+    :param loading: How the iframe loads, None to load immediately, "lazy" for the browser's lazy loading, or "placeholder" to load when scrolled into view or clicked (default None)
+    :type loading: str, optional
     :return: HTML iframe string
     :rtype: str
     """
-    prefix = u"http://" if not target.startswith("http") else u""
-    target = prefix + target
-    if scrolling:
-        scroll_val = "yes"
-    else:
-        scroll_val = "no"
-    return u'<iframe frameborder="{frameborder}" scrolling="{scrolling}" style="border:{border}px" src="{url}", width={width} height={height}></iframe>'.format(
-        frameborder=frameborder,
-        scrolling=scroll_val,
-        border=border,
-        url=target,
-        width=width,
-        height=height,
-    )
+    template = _iframe_template(width, height, scrolling, border, frameborder, loading)
+    return template.render(target) + template.script
 
 
 def display_iframe_url(target: str, **kwargs: Any) -> None:
@@ -74,10 +763,128 @@ def display_iframe_url(target: str, **kwargs: Any) -> None:
 
     .. seealso:: :func:`iframe_url` for additional arguments.
     """
+    _load_ipython()
     txt = iframe_url(target, **kwargs)
     display(HTML(txt))
 
 
+def _batch_items(targets: Any) -> Any:
+    """Split each item of a batch into its target and its own options."""
+    for item in targets:
+        if isinstance(item, str):
+            yield item, {}
+        else:
+            target, options = item
+            yield target, options
+
+
+def _joined(fragments: Any, separator: str) -> Any:
+    """Yield the fragments with the separator between them."""
+    first = True
+    for fragment in fragments:
+        if not first:
+            yield separator
+        first = False
+        yield fragment
+
+
+def iter_urls(targets: Any, separator: str = "<br>\n") -> Any:
+    """Generate the HTML links for many URLs one piece at a time.
+
+    The pieces can be written straight to a file, e.g. with
+    ``f.writelines(iter_urls(targets))``, without building the whole page.
+
+    :param targets: URLs, or ``(url, options)`` pairs where the options may give the link ``text``
+    :type targets: iterable
+    :param separator: HTML placed between the links (default a line break)
+    :type separator: str
+    :return: The links and separators
+    :rtype: iterator of str
+    """
+    return _joined(
+        (_url_anchor(target, **options) for target, options in _batch_items(targets)),
+        separator,
+    )
+
+
+def iter_iframe_urls(targets: Any, separator: str = "\n", **kwargs: Any) -> Any:
+    """Generate the iframes for many URLs one piece at a time.
+
+    The pieces can be written straight to a file, e.g. with
+    ``f.writelines(iter_iframe_urls(targets))``, without building the whole page.
+
+    :param targets: URLs, or ``(url, options)`` pairs of a URL and its own :func:`iframe_url` arguments
+    :type targets: iterable
+    :param separator: HTML placed between the iframes (default a new line)
+    :type separator: str
+    :return: The iframes and separators
+    :rtype: iterator of str
+
+    .. seealso:: :func:`iframe_url` for the arguments shared by every iframe.
+    """
+    template = _iframe_template(**kwargs)
+    scripts = set()
+
+    def rendered():
+        for target, options in _batch_items(targets):
+            # items with the same options share one compiled template.
+            item = _iframe_template(**dict(kwargs, **options)) if options else template
+            scripts.add(item.script)
+            yield item.render(target)
+
+    def pieces():
+        for piece in _joined(rendered(), separator):
+            yield piece
+        # placeholders share one loading script per output.
+        script = u"".join(scripts)
+        if script:
+            yield script
+
+    return pieces()
+
+
+def display_urls(targets: Any, separator: str = "<br>\n") -> None:
+    """Display many URLs as links in a single notebook output.
+
+    :param targets: URLs, or ``(url, options)`` pairs where the options may give the link ``text``
+    :type targets: iterable
+    :param separator: HTML placed between the links (default a line break)
+    :type separator: str
+    """
+    _load_ipython()
+    display(HTML(u"".join(iter_urls(targets, separator))))
+
+
+def display_iframe_urls(targets: Any, separator: str = "\n", **kwargs: Any) -> None:
+    """Display the contents of many URLs in a single notebook output.
+
+    :param targets: URLs, or ``(url, options)`` pairs of a URL and its own :func:`iframe_url` arguments
+    :type targets: iterable
+    :param separator: HTML placed between the iframes (default a new line)
+    :type separator: str
+
+    .. seealso:: :func:`iframe_url` for the arguments shared by every iframe.
+    """
+    _load_ipython()
+    display(HTML(u"".join(iter_iframe_urls(targets, separator, **kwargs))))
+
+
+@lru_cache(maxsize=256)
+def _google_book_html(
+    id: str, page: Optional[Union[str, int]], width: int, height: int, query: str
+) -> str:
+    """Build the embed markup for a page of a Google book, once per book, page and size."""
+    url = "https://books.google.co.uk/books?id=" + str(id)
+    if isinstance(page, int):
+        url += "&pg=PA" + str(page)
+    elif page is not None:
+        url += "&pg=" + str(page)
+    url += "&output=embed"
+    if query:
+        url += "&" + query
+    return IFrame(url, width=width, height=height)._repr_html_()
+
+
 def display_google_book(
     id: str, 
     page: Optional[Union[str, int]] = None, 
@@ -95,55 +902,378 @@ def display_google_book(
     :type width: int
     :param height: The height of the embedded book (default 450)
     :type height: int
+    :param **kwargs: Further query parameters for the embed URL
     """
-    if isinstance(page, int):
-        url = "https://books.google.co.uk/books?id={id}&pg=PA{page}&output=embed".format(
-            id=id, page=page
-        )
-    else:
-        url = "https://books.google.co.uk/books?id={id}&pg={page}&output=embed".format(
-            id=id, page=page
-        )
-    IFrame(url, width=width, height=height, **kwargs)
+    _load_ipython()
+    # the parameters are encoded before the lookup so any value IFrame
+    # accepted, e.g. a list, can be part of the cache key.
+    display(HTML(_google_book_html(id, page, width, height, urlencode(kwargs))))
+
+
+def display_google_books(
+    books: Any,
+    width: int = 600,
+    height: int = 450,
+    **kwargs: Any
+) -> None:
+    """Display embedded pages of several Google books in a single output.
+
+    :param books: Book IDs, or ``(id, page)`` pairs for a start page
+    :type books: iterable
+    :param width: The width of each embedded book (default 600)
+    :type width: int
+    :param height: The height of each embedded book (default 450)
+    :type height: int
+    :param **kwargs: Further query parameters for the embed URLs
+
+    .. seealso:: :func:`display_google_book` to display a single book.
+    """
+    _load_ipython()
+    query = urlencode(kwargs)
+    fragments = []
+    for book in books:
+        id, page = (book, None) if isinstance(book, str) else book
+        fragments.append(_google_book_html(id, page, width, height, query))
+    display(HTML(u"".join(fragments)))
+
+
+# the scripts only define the toggle the first time they run in a page, so
+# every output carries its own copy without registering the handler twice.
+_CODE_TOGGLE_JQUERY = string.Template("""<script>
+if (!window.code_toggle) {
+code_show=$show;
+window.code_toggle = function code_toggle() {
+ if (code_show){
+ $$('div.input').show();
+ } else {
+ $$('div.input').hide();
+ }
+ code_show = !code_show
+};
+$$( document ).ready(code_toggle);
+}
+</script>
+""")
+
+# plain DOM version that also finds the input areas of JupyterLab cells, its
+# names differ so it doesn't replace the jQuery toggle in the same page.
+_CODE_TOGGLE_DOM = string.Template("""<script>
+if (!window.notutils_code_toggle) {
+notutils_code_show=$show;
+window.notutils_code_toggle = function notutils_code_toggle() {
+ var inputs = document.querySelectorAll('div.input, .jp-Cell-inputWrapper');
+ for (var i = 0; i < inputs.length; i++) {
+ inputs[i].style.display = notutils_code_show ? '' : 'none';
+ }
+ notutils_code_show = !notutils_code_show
+};
+if (document.readyState === 'loading') {
+ document.addEventListener('DOMContentLoaded', notutils_code_toggle);
+} else {
+ notutils_code_toggle();
+}
+}
+</script>
+""")
 
 
-def code_toggle(start_show: bool = False, message: Optional[str] = None) -> None:
+def code_toggle(
+    start_show: bool = False,
+    message: Optional[str] = None,
+    jquery: bool = True,
+) -> None:
     """Toggle code visibility on and off in a notebook.
     
     The tip that this idea is based on is from Damian Kao (http://blog.nextgenetics.net/?e=102).
+
+    Each call carries the toggle script, but the browser only defines the
+    toggle the first time, so calling it from several sections of a notebook
+    registers the handler once.
     
     :param start_show: Whether to display the code or not on first load (default False)
     :type start_show: bool
     :param message: The message used to toggle display of the code
     :type message: str, optional
+    :param jquery: Whether to use jQuery, which is only available in the classic notebook (default True)
+    :type jquery: bool
     """
-    html = "<script>\n"
+    _load_ipython()
+    show = u"true" if start_show else u"false"
+    if jquery:
+        html = _CODE_TOGGLE_JQUERY.substitute(show=show)
+        toggle = u"code_toggle"
+    else:
+        html = _CODE_TOGGLE_DOM.substitute(show=show)
+        toggle = u"notutils_code_toggle"
     if message is None:
         message = (
             u"The raw code for this jupyter notebook can be hidden for easier reading."
         )
-    if start_show:
-        html += u"code_show=true;\n"
-    else:
-        html += u"code_show=false;\n"
-    html += """function code_toggle() {
- if (code_show){
- $('div.input').show();
- } else {
- $('div.input').hide();
- }
- code_show = !code_show
-} 
-$( document ).ready(code_toggle);
-</script>
-"""
     html += (
         message
-        + ' To toggle on/off the raw code, click <a href="javascript:code_toggle()">here</a>.'
+        + ' To toggle on/off the raw code, click <a href="javascript:'
+        + toggle
+        + '()">here</a>.'
     )
     display(HTML(html))
 
 
+def _basis_cache_key(basis: Callable, num_basis: int, basis_args: Dict[str, Any]) -> Tuple:
+    """Build a hashable key identifying a basis matrix.
+
+    Unhashable argument values (e.g. arrays of centres) are keyed by identity.
+
+    :param basis: The basis function
+    :type basis: callable
+    :param num_basis: Number of basis functions
+    :type num_basis: int
+    :param basis_args: Keyword arguments passed to the basis function
+    :type basis_args: dict
+    :return: Cache key
+    :rtype: tuple
+    """
+    items = []
+    for key, value in sorted(basis_args.items()):
+        try:
+            hash(value)
+        except TypeError:
+            value = ("id", id(value))
+        items.append((key, value))
+    return basis, num_basis, tuple(items)
+
+
+def _minmax_decimate(x: Any, y: Any, xlim: Tuple[float, float], num_columns: int) -> Tuple[Any, Any]:
+    """Reduce dense curves to their minimum and maximum in each pixel column.
+
+    :param x: Sorted input locations, shape (num_points,)
+    :type x: numpy.ndarray
+    :param y: Curve values, shape (num_points,) or (num_points, num_curves)
+    :type y: numpy.ndarray
+    :param xlim: Visible limits of the x axis
+    :type xlim: tuple of float
+    :param num_columns: Number of pixel columns spanned by the axes
+    :type num_columns: int
+    :return: Decimated x and y with two points for each occupied column
+    :rtype: tuple
+    """
+    import numpy as np
+
+    lo, hi = min(xlim), max(xlim)
+    visible = (x >= lo) & (x <= hi)
+    x = x[visible]
+    y = np.asarray(y)[visible]
+    num_columns = max(int(num_columns), 1)
+    if x.shape[0] <= 2 * num_columns:
+        return x, y
+    column = np.minimum(((x - lo) / (hi - lo) * num_columns).astype(int), num_columns - 1)
+    starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    ends = np.r_[starts[1:], x.shape[0]] - 1
+    xd = np.empty(2 * starts.shape[0])
+    xd[0::2] = x[starts]
+    xd[1::2] = x[ends]
+    yd = np.empty((xd.shape[0],) + y.shape[1:], dtype=y.dtype)
+    yd[0::2] = np.minimum.reduceat(y, starts, axis=0)
+    yd[1::2] = np.maximum.reduceat(y, starts, axis=0)
+    return xd, yd
+
+
+class _BlitRenderer:
+    """Redraw the animated artists of a figure over a cached background.
+
+    The static parts of the figure (axes, ticks, labels) are rendered once and
+    stored with ``copy_from_bbox``; each update restores that region and draws
+    only the animated artists on top before encoding the canvas buffer as PNG.
+    """
+
+    def __init__(self, fig: Any, artists: Any) -> None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.fig = fig
+        if not isinstance(fig.canvas, FigureCanvasAgg):
+            FigureCanvasAgg(fig)
+        self.canvas = fig.canvas
+        self.artists = list(artists)
+        self.background = None
+        for artist in self.artists:
+            artist.set_animated(True)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    @staticmethod
+    def supported(fig: Any) -> bool:
+        """Check whether the figure canvas is an Agg canvas that can blit.
+
+        :param fig: Matplotlib figure object
+        :type fig: matplotlib.figure.Figure
+        :return: True if blitting is available for this figure
+        :rtype: bool
+        """
+        from matplotlib.backend_bases import FigureCanvasBase
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        canvas = getattr(fig, "canvas", None)
+        # a figure closed by pyplot is left with a base canvas, which can be
+        # replaced by an Agg canvas for offscreen rendering.
+        return type(canvas) is FigureCanvasBase or (
+            isinstance(canvas, FigureCanvasAgg) and canvas.supports_blit
+        )
+
+    def _on_draw(self, event: Any) -> None:
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def update(self) -> bytes:
+        """Redraw the animated artists and return the canvas as PNG bytes.
+
+        :return: PNG encoded image of the figure
+        :rtype: bytes
+        """
+        import numpy as np
+        from matplotlib.image import imsave
+
+        if self.background is None:
+            # full draw, the draw_event handler caches the background.
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+        buf = io.BytesIO()
+        imsave(buf, np.asarray(self.canvas.buffer_rgba()), format="png")
+        return buf.getvalue()
+
+
+_PREDICTION_TEMPLATE = string.Template("""<div id="$id" class="notutils-prediction">
+<p class="notutils-fallback">This interactive plot needs JavaScript, call display_prediction without redraw="client" to use the widget instead.</p>
+</div>
+<script>
+(function() {
+  var data = $data;
+  var root = document.getElementById("$id");
+  root.innerHTML = "";
+  var controls = document.createElement("div");
+  var canvas = document.createElement("canvas");
+  canvas.width = data.width;
+  canvas.height = data.height;
+  var names = Object.keys(data.bases);
+  var select = null;
+  if (names.length > 1) {
+    select = document.createElement("select");
+    names.forEach(function(name) {
+      var option = document.createElement("option");
+      option.value = name;
+      option.text = name;
+      select.appendChild(option);
+    });
+    controls.appendChild(select);
+  }
+  var sliders = data.wlims.map(function(lim, i) {
+    var label = document.createElement("label");
+    var slider = document.createElement("input");
+    slider.type = "range";
+    slider.min = lim[0];
+    slider.max = lim[1];
+    slider.step = (lim[1] - lim[0]) / 100;
+    slider.value = Math.min(Math.max(0, lim[0]), lim[1]);
+    label.appendChild(document.createTextNode(" w_" + i + " "));
+    label.appendChild(slider);
+    controls.appendChild(label);
+    return slider;
+  });
+  var toggle = document.createElement("input");
+  toggle.type = "checkbox";
+  var toggleLabel = document.createElement("label");
+  toggleLabel.appendChild(document.createTextNode(" display_basis "));
+  toggleLabel.appendChild(toggle);
+  controls.appendChild(toggleLabel);
+  root.appendChild(controls);
+  root.appendChild(canvas);
+  var ctx = canvas.getContext("2d");
+  var x = data.x;
+  function px(v) {
+    return (v - data.xlim[0]) / (data.xlim[1] - data.xlim[0]) * canvas.width;
+  }
+  function py(v) {
+    return canvas.height - (v - data.ylim[0]) / (data.ylim[1] - data.ylim[0]) * canvas.height;
+  }
+  function line(y, colour, width) {
+    ctx.strokeStyle = colour;
+    ctx.lineWidth = width;
+    ctx.beginPath();
+    for (var j = 0; j < x.length; j++) {
+      if (j === 0) { ctx.moveTo(px(x[j]), py(y[j])); } else { ctx.lineTo(px(x[j]), py(y[j])); }
+    }
+    ctx.stroke();
+  }
+  function draw() {
+    var Phi = data.bases[select ? select.value : names[0]];
+    var f = new Float64Array(x.length);
+    for (var i = 0; i < Phi.length; i++) {
+      var w = parseFloat(sliders[i].value);
+      for (var j = 0; j < x.length; j++) { f[j] += w * Phi[i][j]; }
+    }
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    ctx.strokeStyle = "#000000";
+    ctx.lineWidth = 1;
+    ctx.strokeRect(0, 0, canvas.width, canvas.height);
+    if (toggle.checked) {
+      Phi.forEach(function(column) { line(column, "#ff0000", 1); });
+    }
+    line(f, "#1f77b4", 2);
+  }
+  controls.addEventListener("input", draw);
+  controls.addEventListener("change", draw);
+  draw();
+})();
+</script>
+""")
+
+
+def _prediction_html(
+    x: Any,
+    bases: Dict[str, Any],
+    wlims: Any,
+    xlim: Tuple[float, float],
+    ylim: Tuple[float, float],
+    width: int = 864,
+    height: int = 288,
+) -> str:
+    """Build a self contained HTML widget that computes predictions in the browser.
+
+    :param x: Input locations, shape (num_points,)
+    :type x: numpy.ndarray
+    :param bases: Basis matrices, shape (num_points, num_basis), by name
+    :type bases: dict
+    :param wlims: Slider limits for each weight
+    :type wlims: list of tuple
+    :param xlim: Limits of the x axis
+    :type xlim: tuple of float
+    :param ylim: Limits of the y axis
+    :type ylim: tuple of float
+    :param width: Width of the canvas in pixels (default 864)
+    :type width: int
+    :param height: Height of the canvas in pixels (default 288)
+    :type height: int
+    :return: HTML string
+    :rtype: str
+    """
+    data = {
+        "x": [float(v) for v in x],
+        # columns are shipped so each basis function is a contiguous array.
+        "bases": {name: Phi.T.tolist() for name, Phi in bases.items()},
+        "wlims": [list(lim) for lim in wlims],
+        "xlim": [float(v) for v in xlim],
+        "ylim": [float(v) for v in ylim],
+        "width": width,
+        "height": height,
+    }
+    return _PREDICTION_TEMPLATE.substitute(
+        id="notutils-" + uuid.uuid4().hex, data=json.dumps(data)
+    )
+
+
 def display_prediction(
     basis: Union[Callable, Dict[str, Callable]],
     num_basis: int = 4,
@@ -154,9 +1284,39 @@ def display_prediction(
     ylim: Optional[Tuple[float, float]] = None,
     num_points: int = 1000,
     offset: float = 0.0,
+    redraw: str = "full",
+    continuous_update: bool = True,
+    manual: bool = False,
+    counter: Optional[EventCounter] = None,
+    weight_samples: Optional[Any] = None,
+    decimate: bool = False,
+    dtype: Any = "float64",
     **kwargs: Any
 ) -> None:
     """Interactive widget for displaying a prediction function based on summing separate basis functions.
+
+    With ``redraw="blit"`` the axes, ticks, labels and weight samples are
+    rendered once per basis and only the prediction and basis lines are
+    redrawn on each slider event. This requires an Agg based canvas, other
+    canvases fall back to a full redraw.
+
+    With ``redraw="client"`` the basis matrices are sent to the browser once
+    and the prediction is computed and drawn in JavaScript, so moving a slider
+    needs no round trip to the kernel.
+
+    A family of predictions, e.g. samples from a prior over the weights, can
+    be shown behind the interactive prediction by passing ``weight_samples``.
+    All the curves are computed with a single matrix product and drawn as one
+    line collection.
+
+    For large ``num_points`` set ``decimate=True``: curves are still evaluated
+    on the dense grid but only the minimum and maximum within each pixel column
+    of the axes are drawn, and the curves are decimated again when the x limits
+    change.
+
+    Passing ``dtype="float32"`` halves the memory held by the input grid and
+    the cached basis matrices. The cached arrays are released when the widget
+    is closed.
     
     :param basis: A function handle that calls the basis functions
     :type basis: callable or dict
@@ -176,10 +1336,41 @@ def display_prediction(
     :type num_points: int
     :param offset: Offset for the first basis function (default 0.0)
     :type offset: float
+    :param redraw: Redraw strategy, one of "full", "blit" or "client" (default "full")
+    :type redraw: str
+    :param continuous_update: Whether to redraw while sliders are dragged rather than on release (default True)
+    :type continuous_update: bool
+    :param manual: Whether to only redraw when an update button is pressed (default False)
+    :type manual: bool
+    :param counter: Counter incremented for every processed slider event (optional)
+    :type counter: EventCounter, optional
+    :param weight_samples: Weight vectors to plot predictions for, shape (num_basis, num_samples) (optional)
+    :type weight_samples: numpy.ndarray, optional
+    :param decimate: Whether to draw curves decimated to the axes pixel width (default False)
+    :type decimate: bool
+    :param dtype: Floating point type of the input grid and basis matrices (default "float64")
+    :type dtype: str or numpy.dtype
     """
+    _load_ipython()
     import numpy as np
     import pylab as plt
 
+    if redraw not in ("full", "blit", "client"):
+        raise ValueError(
+            "redraw must be one of 'full', 'blit' or 'client', got {!r}".format(redraw)
+        )
+
+    if weight_samples is not None:
+        weight_samples = np.asarray(weight_samples, dtype=dtype)
+        if weight_samples.ndim == 1:
+            weight_samples = weight_samples[:, None]
+        if weight_samples.ndim != 2 or weight_samples.shape[0] != num_basis:
+            raise ValueError(
+                "weight_samples must have shape (num_basis, num_samples), got {}".format(
+                    weight_samples.shape
+                )
+            )
+
     if fig is not None:
         if ax is None:
             ax = fig.gca()
@@ -196,8 +1387,10 @@ def display_prediction(
             ylim = (-1.0, 1.0)
 
     # initialise X and set up W arguments.
-    x = np.zeros((num_points, 1))
-    x[:, 0] = np.linspace(xlim[0], xlim[1], num_points)
+    # x is a column view onto a contiguous grid, the basis functions expect a
+    # (num_points, 1) design matrix.
+    x_grid = np.linspace(xlim[0], xlim[1], num_points, dtype=dtype)
+    x = x_grid[:, None]
     param_args = {}
     for i in range(num_basis):
         lim = list(wlim)
@@ -206,17 +1399,55 @@ def display_prediction(
             lim[1] += offset
         param_args["w_" + str(i)] = tuple(lim)
 
+    # the basis matrix only depends on the basis and its arguments, so it is
+    # computed once per basis and reused as the weight sliders move.
+    basis_cache = {}
+
+    def compute_basis(basis, x, num_basis, **kwargs):
+        key = _basis_cache_key(basis, num_basis, kwargs)
+        if key not in basis_cache:
+            basis_cache[key] = np.ascontiguousarray(basis(x, num_basis, **kwargs), dtype=dtype)
+        return basis_cache[key]
+
     # helper function for making basis prediction.
     def predict_basis(w, basis, x, num_basis, **kwargs):
-        Phi = basis(x, num_basis, **kwargs)
+        Phi = compute_basis(basis, x, num_basis, **kwargs)
         f = np.dot(Phi, w)
         return f, Phi
 
+    def decimated(y):
+        # dense curves are reduced to a min/max pair per pixel column, so the
+        # rendering cost is set by the axes width rather than num_points.
+        if not decimate:
+            return x_grid, y
+        return _minmax_decimate(x_grid, y, ax.get_xlim(), ax.bbox.width)
+
+    def sample_segments(Phi):
+        # one matrix product gives every sample curve, shape (num_points, num_samples).
+        xd, F = decimated(np.dot(Phi, weight_samples))
+        segments = np.empty((F.shape[1], F.shape[0], 2), dtype=F.dtype)
+        segments[:, :, 0] = xd
+        segments[:, :, 1] = F.T
+        return segments
+
+    if redraw == "client":
+        if isinstance(basis, dict):
+            named = basis
+        else:
+            named = {getattr(basis, "__name__", "basis"): basis}
+        bases = {
+            name: compute_basis(use, x, num_basis, **kwargs) for name, use in named.items()
+        }
+        display(
+            HTML(_prediction_html(x_grid, bases, list(param_args.values()), xlim, ylim))
+        )
+        return
+
     if isinstance(basis, dict):
         use_basis = basis[list(basis.keys())[0]]
     else:
         use_basis = basis
-    f, Phi = predict_basis(np.zeros((num_basis, 1)), use_basis, x, num_basis, **kwargs)
+    f, Phi = predict_basis(np.zeros((num_basis, 1), dtype=dtype), use_basis, x, num_basis, **kwargs)
     if fig is None:
         fig, ax = plt.subplots(figsize=(12, 4))
         if ax is not None:
@@ -224,14 +1455,63 @@ def display_prediction(
             ax.set_xlim(xlim)
 
     if ax is not None:
-        predline = ax.plot(x, f, linewidth=2)[0]
+        sample_lines = None
+        if weight_samples is not None:
+            from matplotlib.collections import LineCollection
+
+            sample_lines = LineCollection(
+                sample_segments(Phi), colors="0.7", linewidths=0.5, zorder=1
+            )
+            ax.add_collection(sample_lines)
+        xd, fd = decimated(f)
+        predline = ax.plot(xd, fd, linewidth=2)[0]
+        xd, Phid = decimated(Phi)
         basislines = []
         for i in range(num_basis):
-            basislines.append(ax.plot(x, Phi[:, i], "r")[0])
+            basislines.append(ax.plot(xd, Phid[:, i], "r")[0])
 
         ax.set_ylim(ylim)
         ax.set_xlim(xlim)
 
+        plt.close(fig)
+        renderer = None
+        if redraw == "blit" and _BlitRenderer.supported(fig):
+            # the weight samples only change with the basis, so they are drawn
+            # into the cached background rather than on every event.
+            renderer = _BlitRenderer(fig, [predline] + basislines)
+
+        # inputs of the last rendered event, so that only the artists whose
+        # inputs changed are updated.
+        last = {
+            "predline": None,
+            "basislines": None,
+            "Phi": None,
+            "w": None,
+            "f": None,
+            "display_basis": None,
+        }
+
+        def set_curves(predline, basislines, Phi, f):
+            xd, Phid = decimated(Phi)
+            predline.set_xdata(xd)
+            predline.set_ydata(decimated(f)[1])
+            for i in range(num_basis):
+                basislines[i].set_xdata(xd)
+                basislines[i].set_ydata(Phid[:, i])
+            if sample_lines is not None:
+                sample_lines.set_segments(sample_segments(Phi))
+                if renderer is not None:
+                    # capture the background again with the new samples.
+                    renderer.background = None
+
+        if decimate:
+
+            def redecimate(ax):
+                if last["Phi"] is not None:
+                    set_curves(last["predline"], last["basislines"], last["Phi"], last["f"])
+
+            ax.callbacks.connect("xlim_changed", redecimate)
+
         def generate_function(
             basis,
             num_basis,
@@ -242,30 +1522,57 @@ def display_prediction(
             offset,
             **kwargs
         ):
-            w = np.zeros((num_basis, 1))
+            if counter is not None:
+                counter.events += 1
+            w = np.zeros((num_basis, 1), dtype=dtype)
             for i in range(num_basis):
                 w[i] = kwargs["w_" + str(i)]
-            f, Phi = predict_basis(w, basis, x, num_basis, **basis_args)
-            predline.set_xdata(x[:, 0])
-            predline.set_ydata(f)
-            for i in range(num_basis):
-                basislines[i].set_xdata(x[:, 0])
-                basislines[i].set_ydata(Phi[:, i])
+            Phi = compute_basis(basis, x, num_basis, **basis_args)
+            new_artists = (
+                predline is not last["predline"] or basislines is not last["basislines"]
+            )
+            if new_artists or Phi is not last["Phi"]:
+                f = np.dot(Phi, w)
+                set_curves(predline, basislines, Phi, f)
+            else:
+                # only weights moved, update the prediction by the change in
+                # the weights that differ from the last event.
+                changed = np.flatnonzero(w[:, 0] != last["w"][:, 0])
+                f = last["f"]
+                if changed.size > 0:
+                    f = f + np.dot(Phi[:, changed], w[changed] - last["w"][changed])
+                    predline.set_ydata(decimated(f)[1])
 
-            if display_basis:
+            if new_artists or display_basis != last["display_basis"]:
                 for i in range(num_basis):
-                    basislines[i].set_alpha(1)  # make visible
+                    basislines[i].set_alpha(1 if display_basis else 0)
+            last.update(
+                predline=predline,
+                basislines=basislines,
+                Phi=Phi,
+                w=w,
+                f=f,
+                display_basis=display_basis,
+            )
+            if renderer is not None:
+                display(Image(data=renderer.update(), format="png"))
             else:
-                for i in range(num_basis):
-                    basislines[i].set_alpha(0)
-            display(fig)
+                display(fig)
 
         if not isinstance(basis, dict):
             basis = fixed(basis)
 
-        plt.close(fig)
-        interact(
+        def release(change):
+            # drop the cached arrays once the widget is closed.
+            if change["new"] is None:
+                basis_cache.clear()
+                for key in last:
+                    last[key] = None
+
+        interaction = _interact(
             generate_function,
+            continuous_update=continuous_update,
+            manual=manual,
             basis=basis,
             num_basis=fixed(num_basis),
             predline=fixed(predline),
@@ -275,6 +1582,589 @@ def display_prediction(
             display_basis=False,
             **param_args
         )
+        widget = getattr(interaction, "widget", None)
+        if widget is not None:
+            widget.observe(release, names="comm")
+
+
+_IMAGE_MIME_TYPES = {
+    ".svg": "image/svg+xml",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+}
+
+_EMBEDDED_PLOTS_TEMPLATE = string.Template("""<div id="$id" class="notutils-plots">
+<div class="notutils-controls"></div>
+<img width="$width" height="$height">
+</div>
+<script>
+(function() {
+  var frames = $frames;
+  var dims = $dims;
+  var root = document.getElementById("$id");
+  var controls = root.querySelector(".notutils-controls");
+  var img = root.querySelector("img");
+  var sliders = dims.map(function(dim) {
+    var label = document.createElement("label");
+    var slider = document.createElement("input");
+    var value = document.createElement("span");
+    slider.type = "range";
+    slider.min = 0;
+    slider.max = dim[1].length - 1;
+    slider.step = 1;
+    slider.value = 0;
+    label.appendChild(document.createTextNode(" " + dim[0] + " "));
+    label.appendChild(slider);
+    label.appendChild(value);
+    controls.appendChild(label);
+    return {slider: slider, value: value, labels: dim[1]};
+  });
+  function show() {
+    var key = sliders.map(function(s) {
+      s.value.textContent = " " + s.labels[s.slider.value];
+      return s.slider.value;
+    }).join(",");
+    if (key in frames) {
+      img.src = frames[key];
+      img.style.visibility = "visible";
+    } else {
+      img.style.visibility = "hidden";
+    }
+  }
+  controls.addEventListener("input", show);
+  show();
+})();
+</script>
+""")
+
+
+def _embedded_plots_html(
+    frames: Dict[str, str], dims: list, width: int, height: int
+) -> str:
+    """Build an HTML widget that switches between pre-encoded frames in the browser.
+
+    :param frames: Data URI of each frame keyed by the comma separated slider positions
+    :type frames: dict
+    :param dims: Name and value labels of each slider
+    :type dims: list of tuple
+    :param width: Width of the displayed plots
+    :type width: int
+    :param height: Height of the displayed plots
+    :type height: int
+    :return: HTML string
+    :rtype: str
+    """
+    return _EMBEDDED_PLOTS_TEMPLATE.substitute(
+        id="notutils-" + uuid.uuid4().hex,
+        frames=json.dumps(frames),
+        dims=json.dumps(dims),
+        width=width,
+        height=height,
+    )
+
+
+def _thumbnail(path: str, width: int, height: int, directory: str) -> str:
+    """Return a copy of an image downscaled to fit the display size, creating it if needed.
+
+    Copies are stored in ``directory`` under a name derived from the source
+    path, its modification time and the target size.
+
+    :param path: Path of the source image
+    :type path: str
+    :param width: Width to fit the image in
+    :type width: int
+    :param height: Height to fit the image in
+    :type height: int
+    :param directory: Directory to store the downscaled copies in
+    :type directory: str
+    :return: Path of the downscaled copy, or of the source if it already fits
+    :rtype: str
+    """
+    from PIL import Image as PILImage
+
+    stat = os.stat(path)
+    key = "{}:{}:{}x{}".format(os.path.abspath(path), stat.st_mtime_ns, width, height)
+    _, ext = os.path.splitext(path)
+    target = os.path.join(directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ext.lower())
+    if os.path.exists(target):
+        return target
+    with PILImage.open(path) as image:
+        if image.width <= width and image.height <= height:
+            return path
+        fmt = image.format
+        image.thumbnail((width, height))
+        os.makedirs(directory, exist_ok=True)
+        # write then rename, so parallel workers never see a partial file.
+        partial = "{}.{}.part".format(target, threading.get_ident())
+        image.save(partial, format=fmt)
+    os.replace(partial, target)
+    return target
+
+
+def _animation_html(paths: list, interval: int, width: int, height: int) -> Optional[str]:
+    """Encode a series of image files as a single animation.
+
+    Pillow is used to write an animated WebP, or an APNG if Pillow was built
+    without WebP support. Without Pillow, matplotlib writes an HTML5 video if
+    ffmpeg is available.
+
+    :param paths: Paths or file objects of the frames in display order
+    :type paths: list
+    :param interval: Time between frames in milliseconds
+    :type interval: int
+    :param width: Width of the displayed animation
+    :type width: int
+    :param height: Height of the displayed animation
+    :type height: int
+    :return: HTML string, or None if no encoder is available
+    :rtype: str, optional
+    """
+    try:
+        from PIL import Image as PILImage, features
+
+        use_pil = True
+    except ImportError:
+        use_pil = False
+
+    if use_pil:
+        images = []
+        for path in paths:
+            with PILImage.open(path) as image:
+                images.append(image.convert("RGBA"))
+        size = images[0].size
+        images = [image if image.size == size else image.resize(size) for image in images]
+        if features.check("webp"):
+            fmt, mime = "WEBP", "image/webp"
+        else:
+            fmt, mime = "PNG", "image/png"
+        buf = io.BytesIO()
+        images[0].save(
+            buf,
+            format=fmt,
+            save_all=True,
+            append_images=images[1:],
+            duration=interval,
+            loop=0,
+        )
+        return '<img src="data:{};base64,{}" width={} height={}>'.format(
+            mime, base64.b64encode(buf.getvalue()).decode("ascii"), width, height
+        )
+
+    from matplotlib import animation
+
+    if not animation.writers.is_available("ffmpeg"):
+        return None
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(width / 100.0, height / 100.0), dpi=100)
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    artists = [[ax.imshow(plt.imread(path), animated=True)] for path in paths]
+    anim = animation.ArtistAnimation(fig, artists, interval=interval)
+    html = anim.to_html5_video()
+    plt.close(fig)
+    return html
+
+
+class _PlotFrames:
+    """Locate, read and enumerate the frames of a plot series.
+
+    Everything that doesn't depend on the slider positions is resolved once,
+    leaving a single format call to find the frame for an event.
+
+    :param filebase: Base filename with format placeholders
+    :type filebase: str
+    :param directory: Directory containing the plot files
+    :type directory: str, optional
+    :param width: Width of the displayed plots
+    :type width: int
+    :param height: Height of the displayed plots
+    :type height: int
+    :param cache: Cache for the file contents
+    :type cache: FrameCache
+    :param values: Slider options by field name, used to enumerate and prefetch frames
+    :type values: dict, optional
+    :param index: Index of the frames that exist, unknown frames are skipped
+    :type index: _FrameIndex, optional
+    :param store: Packed frames to read instead of the separate files
+    :type store: FrameStore, optional
+    :param thumbnail_dir: Directory for downscaled raster frames, None to send full size frames
+    :type thumbnail_dir: str, optional
+    :param prefetch: Number of neighbouring frames to read ahead along each slider
+    :type prefetch: int
+    """
+
+    def __init__(
+        self,
+        filebase: str,
+        directory: Optional[str],
+        width: int,
+        height: int,
+        cache: FrameCache,
+        values: Optional[Dict[str, list]] = None,
+        index: Optional[_FrameIndex] = None,
+        store: Optional[FrameStore] = None,
+        thumbnail_dir: Optional[str] = None,
+        prefetch: int = 0,
+    ) -> None:
+        self.filebase = filebase
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.cache = cache
+        self.values = values or {}
+        self.index = index
+        self.store = store
+        self.thumbnail_dir = thumbnail_dir
+        self.prefetch = prefetch
+        self.ext = os.path.splitext(filebase)[1].lower()
+        self.raster = self.ext in (".png", ".jpg", ".jpeg", ".gif")
+        self.prefix = directory + "/" if directory is not None else ""
+        path_format = self.prefix.replace("{", "{{").replace("}", "}}") + filebase
+        self.frame_path = path_format.format
+        self.downscale = thumbnail_dir is not None and self.ext in (".png", ".jpg", ".jpeg")
+        # the IPython display object for a frame, None for unknown file types.
+        self.render: Optional[Callable[[str], Any]] = None
+        if self.ext == ".svg":
+            self.render = self._render_svg
+        elif self.raster:
+            self.render = self._render_image
+        elif self.ext == ".html":
+            self.render = self._render_iframe
+        # the modification time and the path read for each frame, i.e. its
+        # cached thumbnail if it has one.
+        self._sources: Dict[str, Tuple[int, str]] = {}
+        self._prefetches: List[Any] = []
+
+    def locate(self, kwargs: Dict[str, Any]) -> Optional[str]:
+        """The path of the frame for the slider values, None if it isn't in the index."""
+        if self.index is None:
+            return self.frame_path(**kwargs)
+        filename = self.index.find(kwargs)
+        return None if filename is None else self.prefix + filename
+
+    def source(self, path: str) -> str:
+        """The downscaled copy of a raster frame when thumbnails are enabled."""
+        if not self.downscale or self.thumbnail_dir is None:
+            return path
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            entry = self._sources.get(path)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+            source = _thumbnail(path, self.width, self.height, self.thumbnail_dir)
+        except OSError:
+            return path
+        self._sources[path] = (mtime, source)
+        return source
+
+    def read_frame(self, path: str) -> bytes:
+        """Read a frame from the store or through the cache.
+
+        A frame in the store is sliced out of the mapped file without a read,
+        then copied once into the bytes that the IPython and widget image
+        classes require.
+        """
+        if self.store is not None:
+            with self.store.read(path[len(self.prefix):]) as view:
+                return bytes(view)
+        return self.cache.read(path)
+
+    def read_source(self, path: str) -> bytes:
+        """Read the frame that is sent to the browser."""
+        return self.read_frame(self.source(path))
+
+    def prefetch_neighbours(self, kwargs: Dict[str, Any]) -> None:
+        """Read the frames next to the slider values in background threads."""
+        if self.prefetch <= 0 or self.store is not None:
+            # the packed frames are already mapped into memory.
+            return
+        # neighbours of an earlier position that haven't been read yet are
+        # no longer needed.
+        for future in self._prefetches:
+            future.cancel()
+        self._prefetches = []
+        for name, options in self.values.items():
+            if len(options) < 2 or name not in kwargs:
+                continue
+            index = _nearest_index(options, kwargs[name])
+            if index is None:
+                continue
+            for distance in range(1, self.prefetch + 1):
+                for neighbour in (index + distance, index - distance):
+                    if 0 <= neighbour < len(options):
+                        neighbour_kwargs = dict(kwargs, **{name: options[neighbour]})
+                        path = self.locate(neighbour_kwargs)
+                        if path is not None and self._known_source(path) not in self.cache:
+                            self._prefetches.append(
+                                _background_executor().submit(self.read_source, path)
+                            )
+
+    def _known_source(self, path: str) -> str:
+        # the path last read for a frame, without touching the file.
+        entry = self._sources.get(path)
+        return path if entry is None else entry[1]
+
+    def iter_frames(self) -> Any:
+        """Every available frame in slider order, with the slider positions."""
+        names = list(self.values)
+        positions = [range(len(self.values[name])) for name in names]
+        for position in itertools.product(*positions):
+            frame_kwargs = {name: self.values[name][i] for name, i in zip(names, position)}
+            path = self.locate(frame_kwargs)
+            if path is not None:
+                yield dict(zip(names, position)), path
+
+    def make_thumbnails(self) -> List[Any]:
+        """Make the downscaled copy of every frame in parallel on the thumbnail pool.
+
+        Each thread takes every ``n``-th frame, so the first frames are ready first.
+        """
+        paths = [path for _, path in self.iter_frames()]
+        executor = _thumbnail_executor()
+        return [
+            executor.submit(self._make_thumbnails, paths[start::_THUMBNAIL_WORKERS])
+            for start in range(min(_THUMBNAIL_WORKERS, len(paths)))
+        ]
+
+    def _make_thumbnails(self, paths: List[str]) -> None:
+        for path in paths:
+            self.source(path)
+
+    def view(self) -> Any:
+        """A widget that can show any frame of the series."""
+        import ipywidgets as widgets
+
+        if self.raster:
+            return widgets.Image(format=self.ext[1:], width=self.width, height=self.height)
+        return widgets.HTML()
+
+    def view_value(self, path: str) -> Any:
+        """The value of the view widget that shows a frame."""
+        if self.raster:
+            return self.read_source(path)
+        if self.ext == ".svg":
+            return self.read_source(path).decode("utf-8")
+        return IFrame(src=path, width=self.width, height=self.height)._repr_html_()
+
+    def _load(self, path: str) -> Any:
+        try:
+            return self.read_frame(path)
+        except OSError:
+            # let IPython report files that can't be read.
+            return path
+
+    def _render_svg(self, path: str) -> Any:
+        return SVG(data=self._load(path))
+
+    def _render_image(self, path: str) -> Any:
+        return Image(
+            data=self._load(self.source(path)),
+            format=self.ext[1:],
+            width=self.width,
+            height=self.height,
+        )
+
+    def _render_iframe(self, path: str) -> Any:
+        return IFrame(src=path, width=self.width, height=self.height)
+
+
+def _embedded_frames_html(frames: _PlotFrames, max_embed_mb: float) -> Optional[str]:
+    """Build the client side player for every frame, or None if they can't be embedded."""
+    mime = _IMAGE_MIME_TYPES.get(frames.ext)
+    if mime is None:
+        warnings.warn("Can't embed {} files, using interact instead.".format(frames.ext))
+        return None
+    values = frames.values
+    dims = [(name, [str(v) for v in values[name]]) for name in values if len(values[name]) > 1]
+    encoded = {}
+    total = 0
+    for position, path in frames.iter_frames():
+        try:
+            data = frames.read_source(path)
+        except OSError:
+            continue
+        total += len(data)
+        if total > max_embed_mb * 1024 * 1024:
+            warnings.warn(
+                "Frames exceed max_embed_mb={}, using interact instead.".format(max_embed_mb)
+            )
+            return None
+        key = ",".join(str(position[name]) for name, _ in dims)
+        encoded[key] = "data:{};base64,{}".format(mime, base64.b64encode(data).decode("ascii"))
+    return _embedded_plots_html(encoded, dims, frames.width, frames.height)
+
+
+def _animated_frames_html(frames: _PlotFrames, interval: int, max_embed_mb: float) -> Optional[str]:
+    """Build an animation of every frame, or None if they can't be animated."""
+    if not frames.raster:
+        warnings.warn("Can't animate {} files, using interact instead.".format(frames.ext))
+        return None
+    paths: List[Any]
+    if frames.store is not None:
+        paths = [io.BytesIO(frames.read_frame(path)) for _, path in frames.iter_frames()]
+    else:
+        paths = [frames.source(path) for _, path in frames.iter_frames() if os.path.exists(path)]
+    if not paths:
+        warnings.warn("No frames found to animate, using interact instead.")
+        return None
+    html = _animation_html(paths, interval, frames.width, frames.height)
+    if html is None:
+        warnings.warn("No animation encoder available, using interact instead.")
+    elif len(html) > max_embed_mb * 1024 * 1024:
+        warnings.warn(
+            "Animation exceeds max_embed_mb={}, using interact instead.".format(max_embed_mb)
+        )
+        return None
+    return html
+
+
+def _display_frame_view(
+    frames: _PlotFrames,
+    controls: Dict[str, Any],
+    asynchronous: bool = False,
+    continuous_update: bool = True,
+    manual: bool = False,
+    counter: Optional[EventCounter] = None,
+) -> None:
+    """Display the sliders above a persistent widget whose value is swapped for each frame.
+
+    :param frames: The frames of the plot series
+    :type frames: _PlotFrames
+    :param controls: Slider widgets by field name
+    :type controls: dict
+    :param asynchronous: Whether to read the frames in a background thread (default False)
+    :type asynchronous: bool
+    :param continuous_update: Whether to load plots while sliders are dragged (default True)
+    :type continuous_update: bool
+    :param manual: Whether to only load a plot when an update button is pressed (default False)
+    :type manual: bool
+    :param counter: Counter incremented for every processed slider event (optional)
+    :type counter: EventCounter, optional
+    """
+    import ipywidgets as widgets
+
+    view = frames.view()
+    sliders = []
+    for name, widget in controls.items():
+        if isinstance(widget, fixed):
+            continue
+        # label and rate limit the sliders as interact does.
+        if not widget.description:
+            widget.description = name
+        if not continuous_update and hasattr(widget, "continuous_update"):
+            widget.continuous_update = False
+        sliders.append(widget)
+    pending = {"generation": 0, "future": None}
+    lock = threading.Lock()
+
+    def on_change(change=None):
+        if counter is not None:
+            counter.events += 1
+        frame_kwargs = {name: widget.value for name, widget in controls.items()}
+        with lock:
+            pending["generation"] += 1
+            generation = pending["generation"]
+        if pending["future"] is not None:
+            # a load that hasn't started yet is no longer needed.
+            pending["future"].cancel()
+            pending["future"] = None
+        path = frames.locate(frame_kwargs)
+        if path is None:
+            return
+        if asynchronous:
+
+            def done(future):
+                if future.cancelled() or future.exception() is not None:
+                    return
+                with lock:
+                    if generation == pending["generation"]:
+                        view.value = future.result()
+
+            future = _display_executor().submit(frames.view_value, path)
+            pending["future"] = future
+            future.add_done_callback(done)
+        else:
+            try:
+                view.value = frames.view_value(path)
+            except OSError:
+                # keep showing the last frame that could be read.
+                pass
+        frames.prefetch_neighbours(frame_kwargs)
+
+    if manual:
+        button = widgets.Button(description="Run Interact")
+        button.on_click(lambda button: on_change())
+        display(widgets.VBox(sliders + [button, view]))
+        return
+    for widget in sliders:
+        widget.observe(on_change, names="value")
+    display(widgets.VBox(sliders + [view]))
+    on_change()
+
+
+def _interact_frames(
+    frames: _PlotFrames,
+    controls: Dict[str, Any],
+    continuous_update: bool = True,
+    manual: bool = False,
+    counter: Optional[EventCounter] = None,
+) -> None:
+    """Display the frames with ``interact``, showing a new display object for each event.
+
+    :param frames: The frames of the plot series
+    :type frames: _PlotFrames
+    :param controls: Slider widgets or ``interact`` abbreviations by field name
+    :type controls: dict
+    :param continuous_update: Whether to load plots while sliders are dragged (default True)
+    :type continuous_update: bool
+    :param manual: Whether to only load a plot when an update button is pressed (default False)
+    :type manual: bool
+    :param counter: Counter incremented for every processed slider event (optional)
+    :type counter: EventCounter, optional
+    """
+    render = frames.render
+    prefetching = frames.ext != ".html"
+
+    def show_figure(filebase: str, directory: Optional[str], width: int = 600, height: int = 450, **kwargs: Any) -> None:
+        """Helper function to load in the relevant plot for display.
+
+        The filename format and display class are resolved when the widget is
+        created, so the fixed arguments are only there for ``interact``.
+        
+        :param filebase: Base filename with format placeholders
+        :type filebase: str
+        :param directory: Directory containing the plot files
+        :type directory: str, optional
+        :param width: Width of the displayed plot
+        :type width: int
+        :param height: Height of the displayed plot
+        :type height: int
+        :param **kwargs: Format arguments for the filename
+        """
+        if counter is not None:
+            counter.events += 1
+        if render is None:
+            return
+        path = frames.locate(kwargs)
+        if path is None:
+            return
+        display(render(path))
+        if prefetching:
+            frames.prefetch_neighbours(kwargs)
+
+    _interact(
+        show_figure,
+        continuous_update=continuous_update,
+        manual=manual,
+        filebase=fixed(frames.filebase),
+        directory=fixed(frames.directory),
+        width=fixed(frames.width),
+        height=fixed(frames.height),
+        **controls
+    )
 
 
 def display_plots(
@@ -282,11 +2172,67 @@ def display_plots(
     directory: Optional[str] = None, 
     width: int = 600, 
     height: int = 450, 
+    continuous_update: bool = True,
+    manual: bool = False,
+    counter: Optional[EventCounter] = None,
+    cache: Optional[FrameCache] = None,
+    prefetch: int = 0,
+    index: bool = False,
+    mode: str = "interact",
+    max_embed_mb: float = 20.0,
+    interval: int = 200,
+    thumbnails: bool = False,
+    thumbnail_dir: Optional[str] = None,
+    store: Optional[Union[str, FrameStore]] = None,
     **kwargs: Any
 ) -> None:
     """Display a series of plots controlled by sliders.
     
     The function relies on Python string format functionality to index through a series of plots.
+
+    Image and SVG files are read through a :class:`FrameCache`, by default the
+    module level ``frame_cache`` shared by all calls, so scrubbing back over a
+    series does not read the files from disk again. With ``prefetch`` set, the
+    frames next to the one on screen along each slider are read into the cache
+    in background threads.
+
+    With ``index=True`` the directory is scanned once for files matching
+    ``filebase``. Sliders not given in ``kwargs`` get their range from the
+    files found, and slider positions without a file are skipped without
+    touching the filesystem.
+
+    With ``mode="embed"`` every frame is read up front and sent to the browser
+    in a single payload, and the sliders switch frames in JavaScript without
+    a round trip to the kernel. If the frames add up to more than
+    ``max_embed_mb`` the usual ``interact`` widget is used instead.
+
+    With ``mode="animation"`` the frames are assembled, in slider order, into
+    a single animated WebP or APNG image with Pillow, or an HTML5 video when
+    Pillow is missing and ffmpeg is available. Without an encoder the usual
+    ``interact`` widget is used instead.
+
+    With ``thumbnails=True`` PNG and JPEG frames larger than ``width`` by
+    ``height`` are downscaled once with Pillow and the small copies are cached
+    on disk, so only they are sent to the browser. The copies for the whole
+    series are made in parallel on a pool of background threads when the widget
+    is created.
+
+    With ``mode="widget"`` the frames are shown in a persistent image widget
+    whose value is replaced on each slider event, rather than clearing the
+    output area and displaying a new image. Only the new frame bytes are sent
+    to the browser.
+
+    With ``mode="async"`` the frames are shown in the same persistent widget,
+    but a slider event schedules the file read on a separate thread and the
+    widget is updated when it completes, so the kernel stays responsive while
+    scrubbing. Loads for positions the slider has already left are cancelled
+    or discarded.
+
+    With ``store`` set to a file written by ``pack_frames`` the frames are
+    sliced out of that single memory mapped file rather than opened one by one,
+    which helps for long series on shared file systems. Each frame shown is
+    copied once from the mapping into the bytes sent to the browser. Slider ranges can be
+    inferred from the store with ``index=True`` without scanning the directory.
     
     :param filebase: Base filename with format placeholders for indexing
     :type filebase: str
@@ -296,49 +2242,115 @@ def display_plots(
     :type width: int
     :param height: Height of the displayed plots (default 450)
     :type height: int
+    :param continuous_update: Whether to load plots while sliders are dragged rather than on release (default True)
+    :type continuous_update: bool
+    :param manual: Whether to only load a plot when an update button is pressed (default False)
+    :type manual: bool
+    :param counter: Counter incremented for every processed slider event (optional)
+    :type counter: EventCounter, optional
+    :param cache: Cache for the file contents (default the shared ``frame_cache``)
+    :type cache: FrameCache, optional
+    :param prefetch: Number of neighbouring frames to read ahead along each slider (default 0)
+    :type prefetch: int
+    :param index: Whether to index the directory and infer slider ranges from the files, a ValueError is raised if none match (default False)
+    :type index: bool
+    :param mode: Display mode, one of "interact", "embed", "animation", "widget" or "async" (default "interact")
+    :type mode: str
+    :param max_embed_mb: Largest total size of frames to embed in megabytes (default 20)
+    :type max_embed_mb: float
+    :param interval: Time between animation frames in milliseconds (default 200)
+    :type interval: int
+    :param thumbnails: Whether to send frames downscaled to the display size (default False)
+    :type thumbnails: bool
+    :param thumbnail_dir: Directory for the downscaled frames (default ~/.cache/notutils/thumbnails)
+    :type thumbnail_dir: str, optional
+    :param store: Packed frames written by ``pack_frames`` to read instead of the separate files (optional)
+    :type store: str or FrameStore, optional
     """
+    _load_ipython()
+    if mode not in ("interact", "embed", "animation", "widget", "async"):
+        raise ValueError(
+            "mode must be one of 'interact', 'embed', 'animation', 'widget' or 'async', "
+            "got {!r}".format(mode)
+        )
+    if cache is None:
+        cache = frame_cache
+    if thumbnails:
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            warnings.warn("Thumbnails need Pillow, showing full size frames instead.")
+            thumbnails = False
+        if thumbnail_dir is None:
+            thumbnail_dir = os.path.join(os.path.expanduser("~"), ".cache", "notutils", "thumbnails")
 
-    def show_figure(filebase: str, directory: Optional[str], width: int = 600, height: int = 450, **kwargs: Any) -> None:
-        """Helper function to load in the relevant plot for display.
-        
-        :param filebase: Base filename with format placeholders
-        :type filebase: str
-        :param directory: Directory containing the plot files
-        :type directory: str, optional
-        :param width: Width of the displayed plot
-        :type width: int
-        :param height: Height of the displayed plot
-        :type height: int
-        :param **kwargs: Format arguments for the filename
-        """
-        _, ext = os.path.splitext(filebase)
-        filename = filebase.format(**kwargs)
-        if directory is not None:
-            filename = directory + "/" + filename
-        if ext.lower() == ".svg":
-            display(SVG(data="{filename}".format(filename=filename)))
-        elif ext.lower() in [".png", ".jpg", ".gif", ".jpeg"]:
-            display(
-                Image(
-                    data="{filename}".format(filename=filename),
-                    width=width,
-                    height=height,
-                )
-            )
-        elif ext.lower() in [".html"]:
-            display(
-                IFrame(
-                    src="{filename}".format(filename=filename),
-                    width=width,
-                    height=height,
-                )
-            )
+    frame_index = None
+    opened: Optional[FrameStore] = None
+    if store is not None:
+        if not isinstance(store, FrameStore):
+            store = opened = FrameStore(store)
+        if thumbnails:
+            warnings.warn("Thumbnails aren't made from packed frames, showing full size frames instead.")
+            thumbnails = False
+        frame_index = _FrameIndex(filebase, files=store.files)
+    elif index:
+        frame_index = _FrameIndex(filebase, directory)
+    if index and frame_index is not None:
+        if len(frame_index) == 0:
+            if isinstance(store, FrameStore):
+                scanned = "store {!r}".format(store.path)
+            else:
+                scanned = repr(os.path.join(directory or ".", os.path.dirname(filebase)))
+            raise ValueError("No files matching {!r} found in {}".format(filebase, scanned))
+        for name, abbrev in frame_index.slider_ranges().items():
+            kwargs.setdefault(name, abbrev)
 
-    interact(
-        show_figure,
-        filebase=fixed(filebase),
-        directory=fixed(directory),
-        width=fixed(width),
-        height=fixed(height),
-        **kwargs
+    values = None
+    if prefetch > 0 or thumbnails or mode != "interact":
+        # build the widgets here so the frames can be enumerated from the
+        # same slider ranges that interact uses.
+        kwargs = {
+            name: interactive.widget_from_abbrev(abbrev) for name, abbrev in kwargs.items()
+        }
+        values = {name: _slider_values(widget) for name, widget in kwargs.items()}
+
+    frames = _PlotFrames(
+        filebase,
+        directory,
+        width,
+        height,
+        cache,
+        values=values,
+        index=frame_index,
+        store=store,
+        thumbnail_dir=thumbnail_dir if thumbnails else None,
+        prefetch=prefetch,
     )
+    if opened is not None:
+        # unmap a store opened here once the widget no longer needs the frames.
+        weakref.finalize(frames, opened.close)
+
+    if thumbnails and mode in ("interact", "widget", "async"):
+        frames.make_thumbnails()
+
+    if mode in ("widget", "async"):
+        _display_frame_view(
+            frames,
+            kwargs,
+            asynchronous=mode == "async",
+            continuous_update=continuous_update,
+            manual=manual,
+            counter=counter,
+        )
+        return
+
+    if mode in ("embed", "animation"):
+        if mode == "embed":
+            html = _embedded_frames_html(frames, max_embed_mb)
+        else:
+            html = _animated_frames_html(frames, interval, max_embed_mb)
+        if html is not None:
+            display(HTML(html))
+            return
+
+    _interact_frames(frames, kwargs, continuous_update, manual, counter)
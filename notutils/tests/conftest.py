@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the notutils tests.
+"""
+import os
+
+import pytest
+
+
+def _write_frames(directory, num_frames=3, shape=None):
+    """Write ``frame_<n>.png`` files for ``n`` in ``range(num_frames)``.
+
+    Without a ``shape`` each file holds short placeholder bytes naming its
+    frame; with one each file is a real PNG image of that shape, different
+    for every frame.
+    """
+    for frame in range(num_frames):
+        path = os.path.join(directory, 'frame_{}.png'.format(frame))
+        if shape is None:
+            with open(path, 'wb') as f:
+                f.write(b'\x89PNG frame ' + str(frame).encode())
+        else:
+            import matplotlib.pyplot as plt
+            import numpy as np
+            plt.imsave(path, np.random.RandomState(frame).rand(*shape))
+
+
+@pytest.fixture
+def write_frames():
+    """Return a function writing numbered frame files into a directory."""
+    return _write_frames
@@ -0,0 +1,234 @@
+"""
+Performance benchmarks for the public notutils entry points.
+
+The benchmarks are marked slow, so a normal test run skips them. Compare a run
+against the baseline stored in ``benchmarks/``, failing when a median time
+doubles, with::
+
+    pytest notutils/tests/test_benchmarks.py -m slow --no-cov --benchmark-only \
+        --benchmark-compare=0001 --benchmark-compare-fail=median:100%
+
+After an intended change, remove ``benchmarks/`` and record a new baseline with
+``--benchmark-save=baseline`` in place of the two compare options.
+"""
+import importlib.util
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from ipywidgets import fixed
+
+pytest.importorskip("pytest_benchmark")
+
+from notutils import IframeTemplate, display_plots, display_prediction, display_url, iframe_url
+
+pytestmark = pytest.mark.slow
+
+BACKLOG_SCRIPT = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "backlog", "update_index.py"
+)
+
+
+def _capture_interact(call, *args, **kwargs):
+    """Call an entry point with interact patched and return the callback and its arguments."""
+    with patch("notutils.notutils.interact") as mock_interact:
+        call(*args, **kwargs)
+    func = mock_interact.call_args[0][0]
+    interact_kwargs = {
+        key: val.value if isinstance(val, fixed) else val
+        for key, val in mock_interact.call_args[1].items()
+    }
+    return func, interact_kwargs
+
+
+def _rbf(x, num_basis, **kwargs):
+    centres = np.linspace(-2.0, 2.0, num_basis)
+    return np.exp(-((x - centres) ** 2) / 0.1)
+
+
+def _formatted_iframe_url(target, width=500, height=400, scrolling=True, border=0, frameborder=0):
+    """The iframe_url implementation before templates, kept as the baseline."""
+    prefix = u"http://" if not target.startswith("http") else u""
+    target = prefix + target
+    if scrolling:
+        scroll_val = "yes"
+    else:
+        scroll_val = "no"
+    return u'<iframe frameborder="{frameborder}" scrolling="{scrolling}" style="border:{border}px" src="{url}", width={width} height={height}></iframe>'.format(
+        frameborder=frameborder,
+        scrolling=scroll_val,
+        border=border,
+        url=target,
+        width=width,
+        height=height,
+    )
+
+
+class TestUrlBenchmarks:
+    def test_iframe_url(self, benchmark):
+        benchmark.group = "iframe render"
+        html = benchmark(iframe_url, "example.com/page", width=800, height=600)
+        assert html == _formatted_iframe_url("example.com/page", width=800, height=600)
+
+    def test_iframe_url_formatted(self, benchmark):
+        benchmark.group = "iframe render"
+        html = benchmark(_formatted_iframe_url, "example.com/page", width=800, height=600)
+        assert html.startswith("<iframe")
+
+    def test_iframe_template(self, benchmark):
+        benchmark.group = "iframe render"
+        template = IframeTemplate(width=800, height=600)
+        html = benchmark(template.render, "example.com/page")
+        assert html == _formatted_iframe_url("example.com/page", width=800, height=600)
+
+    @patch("notutils.notutils.display")
+    def test_display_url(self, mock_display, benchmark):
+        benchmark(display_url, "example.com/page")
+        mock_display.assert_called()
+
+
+class TestDisplayPredictionBenchmarks:
+    @pytest.mark.parametrize("num_basis", [4, 16, 64])
+    @pytest.mark.parametrize("num_points", [1000, 10000])
+    def test_event_update(self, benchmark, num_basis, num_points):
+        benchmark.group = "display_prediction event, num_points={}".format(num_points)
+        func, kwargs = _capture_interact(
+            display_prediction, _rbf, num_basis=num_basis, num_points=num_points
+        )
+        for key in kwargs:
+            if key.startswith("w_"):
+                kwargs[key] = 0.0
+        kwargs["display_basis"] = True
+        state = {"w": 0.0}
+
+        def event():
+            # move a slider so every call is a real update.
+            state["w"] = 0.5 - state["w"]
+            kwargs["w_0"] = state["w"]
+            func(**kwargs)
+
+        with patch("notutils.notutils.display"):
+            benchmark(event)
+
+
+@pytest.fixture(scope="module")
+def frames(tmp_path_factory):
+    """Write PNG and SVG frames of increasing size to a temporary directory."""
+    import matplotlib.pyplot as plt
+
+    directory = tmp_path_factory.mktemp("frames")
+    rng = np.random.RandomState(0)
+    for size in [64, 512, 2048]:
+        plt.imsave(os.path.join(directory, "frame_{}_0.png".format(size)),
+                   rng.rand(size, size, 3))
+    for size in [64, 512, 2048]:
+        fig, ax = plt.subplots()
+        ax.plot(rng.randn(size))
+        fig.savefig(os.path.join(directory, "frame_{}_0.svg".format(size)))
+        plt.close(fig)
+    return str(directory)
+
+
+class TestDisplayPlotsBenchmarks:
+    @pytest.mark.parametrize("ext", ["png", "svg"])
+    @pytest.mark.parametrize("size", [64, 512, 2048])
+    def test_slider_load(self, benchmark, frames, size, ext):
+        benchmark.group = "display_plots load, {}".format(ext)
+        filebase = "frame_{size}_{frame}." + ext
+        func, kwargs = _capture_interact(
+            display_plots, filebase, directory=frames, size=size, frame=0
+        )
+        with patch("notutils.notutils.display") as mock_display:
+            benchmark(func, **kwargs)
+        mock_display.assert_called()
+
+    @pytest.mark.parametrize("ext", ["png", "html"])
+    def test_event_overhead(self, benchmark, frames, ext):
+        """Time a slider event with the frame cached and nothing rendered."""
+        benchmark.group = "display_plots event overhead"
+        filebase = "frame_{size}_{frame}." + ext
+        func, kwargs = _capture_interact(
+            display_plots, filebase, directory=frames, size=64, frame=0
+        )
+        displayed = []
+        # plain stand-ins so the timing isn't dominated by mock bookkeeping.
+        with patch("notutils.notutils.display", displayed.append), \
+                patch("notutils.notutils.Image", dict), patch("notutils.notutils.IFrame", dict):
+            func(**kwargs)
+            benchmark(func, **kwargs)
+        assert displayed
+
+    @pytest.mark.parametrize("mode", ["interact", "widget"])
+    def test_frame_swap(self, benchmark, tmp_path, mode):
+        """Compare slider events per second and front-end messages per event."""
+        import comm
+        import matplotlib.pyplot as plt
+
+        benchmark.group = "display_plots frame swap"
+        rng = np.random.RandomState(0)
+        for frame in range(2):
+            plt.imsave(str(tmp_path / "frame_{}.png".format(frame)), rng.rand(512, 512, 3))
+        # every message sent to the front end is recorded by type: widget state
+        # updates go over the comm, while interact clears the output area and
+        # displays a new image into it.
+        messages = []
+
+        def record(msg_type):
+            return lambda *args, **kwargs: messages.append(msg_type)
+
+        with patch.object(comm.DummyComm, "publish_msg",
+                          lambda self, msg_type, *args, **kwargs: messages.append(msg_type)), \
+                patch("ipywidgets.widgets.interaction.clear_output",
+                      side_effect=record("clear_output")), \
+                patch("ipywidgets.interaction.display") as mock_interact_display, \
+                patch("notutils.notutils.display",
+                      side_effect=record("display_data")) as mock_display:
+            display_plots("frame_{frame}.png", directory=str(tmp_path), mode=mode, frame=(0, 1))
+            if mode == "interact":
+                slider = mock_interact_display.call_args[0][0].children[0]
+            else:
+                slider = mock_display.call_args[0][0].children[0]
+            del messages[:]
+            events = []
+
+            def event():
+                events.append(slider.value)
+                slider.value = 1 - slider.value
+
+            benchmark(event)
+        benchmark.extra_info["messages_per_event"] = len(messages) / len(events)
+        benchmark.extra_info["message_types"] = sorted(set(messages))
+
+
+class TestUpdateIndexBenchmarks:
+    TASK = (
+        "# Task: Synthetic task {n}\n\n"
+        "- **ID**: 2025-07-13_task-{n}\n"
+        "- **Title**: Synthetic task {n}\n"
+        "- **Status**: {status}\n"
+        "- **Priority**: Medium\n"
+        "- **Created**: 2025-07-13\n"
+        "- **Last Updated**: 2025-07-{day:02d}\n\n"
+        "## Description\n\nA generated task used for benchmarking.\n"
+    )
+
+    @pytest.mark.parametrize("num_tasks", [1000, 4000])
+    def test_update_index(self, benchmark, tmp_path, capsys, num_tasks):
+        benchmark.group = "backlog update_index"
+        spec = importlib.util.spec_from_file_location("update_index", BACKLOG_SCRIPT)
+        update_index = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(update_index)
+        statuses = update_index.STATUSES
+        for n in range(num_tasks):
+            category = update_index.CATEGORIES[n % len(update_index.CATEGORIES)]
+            (tmp_path / category).mkdir(exist_ok=True)
+            task = self.TASK.format(n=n, status=statuses[n % len(statuses)], day=n % 28 + 1)
+            (tmp_path / category / "2025-07-13_task-{}.md".format(n)).write_text(task)
+        # the script works on the directory containing it.
+        update_index.__file__ = str(tmp_path / "update_index.py")
+
+        benchmark.pedantic(update_index.update_index, rounds=3, iterations=1)
+        capsys.readouterr()
+        content = (tmp_path / "index.md").read_text()
+        assert "[Synthetic task 0]" in content
@@ -104,4 +104,39 @@ class TestCodeToggle:
         mock_display.assert_called_once()
         call_args = mock_display.call_args[0][0]
         html_content = call_args.data
-        assert unicode_message in html_content 
\ No newline at end of file
+        assert unicode_message in html_content 
+
+
+class TestCodeToggleRepeated:
+    """Test cases for calling code_toggle more than once in a notebook."""
+
+    @patch('notutils.notutils.display')
+    def test_code_toggle_script_guarded(self, mock_display):
+        code_toggle()
+        code_toggle(message="Again")
+        first = mock_display.call_args_list[0][0][0].data
+        second = mock_display.call_args_list[1][0][0].data
+        # every output defines the toggle, so re-run or saved outputs work.
+        for html_content in (first, second):
+            assert "if (!window.code_toggle)" in html_content
+            assert 'href="javascript:code_toggle()"' in html_content
+        assert "Again" in second
+
+    @patch('notutils.notutils.display')
+    def test_code_toggle_without_jquery(self, mock_display):
+        code_toggle(jquery=False)
+        html_content = mock_display.call_args[0][0].data
+        assert "notutils_code_show=false" in html_content
+        assert "$(" not in html_content
+        assert "document.querySelectorAll('div.input, .jp-Cell-inputWrapper')" in html_content
+        assert "if (!window.notutils_code_toggle)" in html_content
+        assert 'href="javascript:notutils_code_toggle()"' in html_content
+
+    @patch('notutils.notutils.display')
+    def test_code_toggle_implementations_named_separately(self, mock_display):
+        code_toggle()
+        jquery_html = mock_display.call_args[0][0].data
+        code_toggle(jquery=False)
+        dom_html = mock_display.call_args[0][0].data
+        assert "window.notutils_code_toggle" not in jquery_html
+        assert "window.code_toggle" not in dom_html
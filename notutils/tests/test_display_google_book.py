@@ -3,111 +3,126 @@ Unit tests for display_google_book function.
 """
 import pytest
 from unittest.mock import patch, MagicMock
-from notutils import display_google_book
+from notutils import display_google_book, display_google_books
+
+
+def _displayed_src(mock_display):
+    html_str = mock_display.call_args[0][0].data
+    return html_str.split('src="', 1)[1].split('"', 1)[0]
 
 
 class TestDisplayGoogleBook:
     """Test cases for display_google_book function."""
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_basic(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_basic(self, mock_display):
         book_id = "test123"
         display_google_book(book_id)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
+        mock_display.assert_called_once()
+        html_str = mock_display.call_args[0][0].data
+        url = _displayed_src(mock_display)
         assert "books.google.co.uk/books" in url
         assert f"id={book_id}" in url
         assert "output=embed" in url
-        assert kwargs['width'] == 600
-        assert kwargs['height'] == 450
+        assert "pg=" not in url
+        assert 'width="600"' in html_str
+        assert 'height="450"' in html_str
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_with_int_page(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_with_int_page(self, mock_display):
         book_id = "test123"
         page = 42
         display_google_book(book_id, page=page)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
+        url = _displayed_src(mock_display)
         assert f"pg=PA{page}" in url
         assert f"id={book_id}" in url
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_with_string_page(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_with_string_page(self, mock_display):
         book_id = "test123"
         page = "PR5"
         display_google_book(book_id, page=page)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
+        url = _displayed_src(mock_display)
         assert f"pg={page}" in url
         assert f"id={book_id}" in url
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_custom_dimensions(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_custom_dimensions(self, mock_display):
         book_id = "test123"
         display_google_book(book_id, width=800, height=600)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
-        assert kwargs['width'] == 800
-        assert kwargs['height'] == 600
+        html_str = mock_display.call_args[0][0].data
+        assert 'width="800"' in html_str
+        assert 'height="600"' in html_str
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_with_kwargs(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_with_kwargs(self, mock_display):
         book_id = "test123"
-        display_google_book(book_id, width=800, height=600, frameborder=1)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
-        assert kwargs['width'] == 800
-        assert kwargs['height'] == 600
-        assert kwargs['frameborder'] == 1
+        display_google_book(book_id, width=800, height=600, hl="en")
+        url = _displayed_src(mock_display)
+        assert url.endswith("&output=embed&hl=en")
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_page_zero(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_list_kwarg(self, mock_display):
+        display_google_book("test123", q=["a", "b"])
+        display_google_books(["test123"], q=["a", "b"])
+        assert "&q=%5B%27a%27%2C+%27b%27%5D" in _displayed_src(mock_display)
+
+    @patch('notutils.notutils.display')
+    def test_display_google_book_page_zero(self, mock_display):
         book_id = "test123"
         page = 0
         display_google_book(book_id, page=page)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
-        assert "pg=PA0" in url
+        assert "pg=PA0" in _displayed_src(mock_display)
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_negative_page(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_negative_page(self, mock_display):
         book_id = "test123"
         page = -5
         display_google_book(book_id, page=page)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
-        assert "pg=PA-5" in url
+        assert "pg=PA-5" in _displayed_src(mock_display)
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_special_characters_in_id(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_special_characters_in_id(self, mock_display):
         book_id = "test_123-456"
         display_google_book(book_id)
-        mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
-        assert f"id={book_id}" in url
+        assert f"id={book_id}" in _displayed_src(mock_display)
 
-    @patch('notutils.notutils.IFrame')
-    def test_display_google_book_unicode_id(self, mock_iframe):
+    @patch('notutils.notutils.display')
+    def test_display_google_book_unicode_id(self, mock_display):
         book_id = "test_测试_123"
         display_google_book(book_id)
+        assert f"id={book_id}" in _displayed_src(mock_display)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.IFrame')
+    def test_display_google_book_cached(self, mock_iframe, mock_display):
+        from notutils.notutils import _google_book_html
+        _google_book_html.cache_clear()
+        mock_iframe.return_value._repr_html_.return_value = "<iframe></iframe>"
+        display_google_book("cached", page=3)
+        display_google_book("cached", page=3)
         mock_iframe.assert_called_once()
-        call_args = mock_iframe.call_args
-        url = call_args.args[0]
-        kwargs = call_args.kwargs
-        assert f"id={book_id}" in url 
\ No newline at end of file
+        assert mock_display.call_count == 2
+        _google_book_html.cache_clear()
+
+
+class TestDisplayGoogleBooks:
+    """Test cases for display_google_books function."""
+
+    @patch('notutils.notutils.display')
+    def test_display_google_books_single_output(self, mock_display):
+        display_google_books(["first", ("second", 12), ("third", "PR5")], width=300)
+        mock_display.assert_called_once()
+        html_str = mock_display.call_args[0][0].data
+        assert html_str.count("<iframe") == 3
+        assert "id=first&output=embed" in html_str
+        assert "id=second&pg=PA12" in html_str
+        assert "id=third&pg=PR5" in html_str
+        assert html_str.count('width="300"') == 3
+
+    @patch('notutils.notutils.display')
+    def test_display_google_books_matches_single(self, mock_display):
+        display_google_book("book", page=7)
+        single = mock_display.call_args[0][0].data
+        display_google_books([("book", 7)])
+        assert mock_display.call_args[0][0].data == single
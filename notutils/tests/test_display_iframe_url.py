@@ -98,4 +98,12 @@ class TestDisplayIframeUrl:
             assert "iframe" in actual_html
             assert url in actual_html
             assert 'width=800' in actual_html
-            assert 'height=600' in actual_html 
\ No newline at end of file
+            assert 'height=600' in actual_html 
+
+    @patch('notutils.notutils.display')
+    def test_display_iframe_url_placeholder(self, mock_display):
+        url = "https://www.example.com"
+        display_iframe_url(url, loading="placeholder")
+        html_str = mock_display.call_args[0][0].data
+        assert html_str == iframe_url(url, loading="placeholder")
+        assert html_str.startswith('<div class="notutils-iframe"')
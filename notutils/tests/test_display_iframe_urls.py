@@ -0,0 +1,62 @@
+"""
+Unit tests for iter_iframe_urls and display_iframe_urls functions.
+"""
+import io
+from unittest.mock import patch
+from notutils import display_iframe_urls, iframe_url, iter_iframe_urls
+
+
+class TestIterIframeUrls:
+    """Test cases for iter_iframe_urls function."""
+
+    def test_iter_iframe_urls_matches_iframe_url(self):
+        targets = ["www.example.com", "https://example.org"]
+        html = "".join(iter_iframe_urls(targets, width=800))
+        assert html == "\n".join(iframe_url(t, width=800) for t in targets)
+
+    def test_iter_iframe_urls_per_item_options(self):
+        targets = ["https://example.org", ("https://example.com", {"height": 100, "scrolling": False})]
+        pieces = [p for p in iter_iframe_urls(targets, height=300) if p != "\n"]
+        assert pieces[0] == iframe_url("https://example.org", height=300)
+        assert pieces[1] == iframe_url("https://example.com", height=100, scrolling=False)
+
+    def test_iter_iframe_urls_per_item_template_reused(self):
+        from notutils.notutils import IframeTemplate, _iframe_template
+        _iframe_template.cache_clear()
+        targets = [("https://example.org/{}".format(i), {"height": 100}) for i in range(5)]
+        with patch('notutils.notutils.IframeTemplate', wraps=IframeTemplate) as mock_template:
+            pieces = [p for p in iter_iframe_urls(targets, width=300) if p != "\n"]
+        # one template for the shared options and one for the repeated item options.
+        assert mock_template.call_count == 2
+        assert pieces[4] == iframe_url("https://example.org/4", width=300, height=100)
+
+    def test_iter_iframe_urls_to_file(self):
+        out = io.StringIO()
+        out.writelines(iter_iframe_urls(["https://example.org"] * 3, separator="<hr>"))
+        assert out.getvalue().count("<iframe") == 3
+        assert out.getvalue().count("<hr>") == 2
+
+    def test_iter_iframe_urls_placeholder_script_once(self):
+        targets = ["https://example.org/{}".format(n) for n in range(3)]
+        targets.append(("https://example.com", {"width": 200}))
+        html = "".join(iter_iframe_urls(targets, loading="placeholder"))
+        assert html.count('class="notutils-iframe"') == 4
+        assert html.count("<script>") == 1
+        assert html.endswith("</script>")
+
+    def test_iter_iframe_urls_no_script_without_placeholder(self):
+        targets = ["https://example.org", ("https://example.com", {"loading": "lazy"})]
+        assert "<script>" not in "".join(iter_iframe_urls(targets))
+
+
+class TestDisplayIframeUrls:
+    """Test cases for display_iframe_urls function."""
+
+    @patch('notutils.notutils.display')
+    def test_display_iframe_urls_single_output(self, mock_display):
+        targets = ["https://example.org/{}".format(n) for n in range(50)]
+        display_iframe_urls(targets, width=300)
+        mock_display.assert_called_once()
+        html_str = mock_display.call_args[0][0].data
+        assert html_str.count("<iframe") == 50
+        assert "width=300" in html_str
@@ -8,6 +8,13 @@ from unittest.mock import patch, MagicMock, mock_open
 from notutils import display_plots
 
 
+def _interact_kwargs(mock_interact):
+    """Return the keyword arguments passed to ``interact``, unwrapping ``fixed`` values."""
+    from ipywidgets import fixed
+    return {key: val.value if isinstance(val, fixed) else val
+            for key, val in mock_interact.call_args[1].items()}
+
+
 class TestDisplayPlots:
     """Test cases for display_plots function."""
 
@@ -246,4 +253,753 @@ class TestDisplayPlotsEdgeCases:
     def test_display_plots_html(self, mock_iframe, mock_display):
         display_plots('plot.html', directory=None)
         mock_iframe.assert_called()
-        mock_display.assert_called() 
\ No newline at end of file
+        mock_display.assert_called() 
+
+class TestDisplayPlotsRateLimiting:
+    @patch('notutils.notutils.interact')
+    def test_no_continuous_update_sliders(self, mock_interact):
+        display_plots('plot_{frame}.png', continuous_update=False, frame=(0, 10))
+        kwargs = mock_interact.call_args[1]
+        assert kwargs['frame'].continuous_update is False
+        assert kwargs['frame'].max == 10
+
+    @patch('notutils.notutils.interact')
+    def test_manual_update(self, mock_interact):
+        display_plots('plot_{frame}.png', manual=True, frame=(0, 10))
+        mock_interact.options.assert_called_once_with(manual=True)
+        mock_interact.assert_not_called()
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.Image')
+    def test_counter_counts_events(self, mock_image, mock_display):
+        from notutils import EventCounter
+        counter = EventCounter()
+        display_plots('plot_{frame}.png', counter=counter, frame=(0, 10))
+        assert counter.events == 1
+
+
+class TestDisplayPlotsFrameCache:
+    def test_cache_hits_and_misses(self, tmp_path, write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path, shape=(4, 4))
+        cache = FrameCache()
+        path = os.path.join(tmp_path, 'frame_0.png')
+        data = cache.read(path)
+        assert data.startswith(b'\x89PNG')
+        assert cache.read(path) is data
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert path in cache
+        assert cache.size == len(data)
+
+    def test_cache_rereads_modified_file(self, tmp_path):
+        from notutils import FrameCache
+        path = os.path.join(tmp_path, 'frame.svg')
+        with open(path, 'w') as f:
+            f.write('<svg/>')
+        cache = FrameCache()
+        assert cache.read(path) == b'<svg/>'
+        with open(path, 'w') as f:
+            f.write('<svg></svg>')
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert cache.read(path) == b'<svg></svg>'
+        assert cache.misses == 2
+        assert len(cache) == 1
+
+    def test_cache_evicts_least_recently_used(self, tmp_path):
+        from notutils import FrameCache
+        paths = []
+        for i in range(3):
+            path = os.path.join(tmp_path, 'frame_{}.bin'.format(i))
+            with open(path, 'wb') as f:
+                f.write(b'x' * 400 * 1024)
+            paths.append(path)
+        cache = FrameCache(capacity_mb=1)
+        cache.read(paths[0])
+        cache.read(paths[1])
+        cache.read(paths[0])
+        cache.read(paths[2])
+        assert paths[0] in cache
+        assert paths[1] not in cache
+        assert cache.size <= cache.capacity
+        cache.clear()
+        assert len(cache) == 0 and cache.hits == 0
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_display_plots_reads_through_cache(self, mock_interact, mock_display, tmp_path,
+                                               write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path, shape=(4, 4))
+        cache = FrameCache()
+        display_plots('frame_{frame}.png', directory=str(tmp_path), cache=cache, frame=(0, 2))
+        func = mock_interact.call_args[0][0]
+        kwargs = _interact_kwargs(mock_interact)
+        for frame in [0, 1, 2, 1, 0]:
+            kwargs['frame'] = frame
+            func(**kwargs)
+        assert (cache.hits, cache.misses) == (2, 3)
+        image = mock_display.call_args[0][0]
+        assert image.data.startswith(b'\x89PNG')
+        assert image.width == 600
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_display_plots_uses_shared_cache(self, mock_interact, mock_display, tmp_path,
+                                             write_frames):
+        from notutils import frame_cache
+        write_frames(tmp_path, 1, shape=(4, 4))
+        frame_cache.clear()
+        for _ in range(2):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), frame=(0, 0))
+            func = mock_interact.call_args[0][0]
+            kwargs = _interact_kwargs(mock_interact)
+            kwargs['frame'] = 0
+            func(**kwargs)
+        assert (frame_cache.hits, frame_cache.misses) == (1, 1)
+        frame_cache.clear()
+
+    @patch('notutils.notutils.display')
+    def test_display_plots_svg_bytes(self, mock_display, tmp_path):
+        from notutils import FrameCache
+        with open(os.path.join(tmp_path, 'plot.svg'), 'w') as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg"><rect width="1" height="1"/></svg>')
+        display_plots('plot.svg', directory=str(tmp_path), cache=FrameCache())
+        svg = mock_display.call_args[0][0]
+        assert '<rect' in svg.data
+
+
+class TestDisplayPlotsPrefetch:
+    @staticmethod
+    def _wait_for(cache, paths, timeout=5.0):
+        import time
+        end = time.time() + timeout
+        while time.time() < end:
+            if all(path in cache for path in paths):
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_slider_values(self):
+        from ipywidgets import interactive, fixed
+        from notutils.notutils import _slider_values, _nearest_index
+        assert _slider_values(interactive.widget_from_abbrev((0, 10, 2))) == [0, 2, 4, 6, 8, 10]
+        assert _slider_values(interactive.widget_from_abbrev(['a', 'b'])) == ['a', 'b']
+        assert _slider_values(interactive.widget_from_abbrev({'one': 1, 'two': 2})) == [1, 2]
+        assert _slider_values(interactive.widget_from_abbrev(True)) == [False, True]
+        assert _slider_values(interactive.widget_from_abbrev('text')) == ['text']
+        assert _slider_values(fixed(3)) == [3]
+        assert len(_slider_values(interactive.widget_from_abbrev((0.0, 1.0, 0.1)))) == 11
+        assert _nearest_index([0.0, 0.1, 0.2], 0.10000001) == 1
+        assert _nearest_index(['a', 'b'], 'c') is None
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_neighbours_prefetched(self, mock_interact, mock_display, tmp_path):
+        from notutils import FrameCache
+        for run in ['a', 'b']:
+            for frame in range(6):
+                with open(os.path.join(tmp_path, '{}_{}.svg'.format(run, frame)), 'w') as f:
+                    f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+        cache = FrameCache()
+        display_plots('{run}_{frame}.svg', directory=str(tmp_path), cache=cache,
+                      prefetch=2, run=['a', 'b'], frame=(0, 5))
+        func = mock_interact.call_args[0][0]
+        kwargs = _interact_kwargs(mock_interact)
+        assert kwargs['frame'].max == 5
+        kwargs['run'] = 'a'
+        kwargs['frame'] = 2
+        func(**kwargs)
+        path = str(tmp_path) + '/{}_{}.svg'
+        expected = [path.format('a', f) for f in [0, 1, 3, 4]] + [path.format('b', 2)]
+        assert self._wait_for(cache, expected)
+        assert path.format('a', 5) not in cache
+        hits = cache.hits
+        kwargs['frame'] = 3
+        func(**kwargs)
+        assert cache.hits == hits + 1
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_thumbnails_not_prefetched_twice(self, mock_interact, mock_display, tmp_path,
+                                             write_frames):
+        from concurrent.futures import Future
+        from notutils import FrameCache
+
+        class ImmediateExecutor:
+            submitted = 0
+
+            def submit(self, fn, *args):
+                self.submitted += 1
+                future = Future()
+                future.set_result(fn(*args))
+                return future
+
+        write_frames(tmp_path, num_frames=5, shape=(300, 400))
+        executor = ImmediateExecutor()
+        with patch('notutils.notutils._background_executor', return_value=executor), \
+                patch('notutils.notutils._thumbnail_executor', return_value=executor):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), width=40, height=30,
+                          cache=FrameCache(), thumbnails=True,
+                          thumbnail_dir=str(tmp_path / 'thumbs'), prefetch=1, frame=(0, 4))
+            func = mock_interact.call_args[0][0]
+            kwargs = dict(filebase='frame_{frame}.png', directory=str(tmp_path),
+                          width=40, height=30, frame=2)
+            func(**kwargs)
+            submitted = executor.submitted
+            func(**kwargs)
+            # the neighbours' thumbnails are already cached.
+            assert executor.submitted == submitted
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_stale_prefetches_cancelled(self, mock_interact, mock_display, tmp_path, write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path, num_frames=6)
+        executor = _ManualExecutor()
+        with patch('notutils.notutils._background_executor', return_value=executor):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                          prefetch=1, frame=(0, 5))
+            func = mock_interact.call_args[0][0]
+            kwargs = dict(filebase='frame_{frame}.png', directory=str(tmp_path),
+                          width=600, height=450)
+            func(frame=1, **kwargs)
+            first = [future for future, _, _ in executor.calls]
+            assert len(first) == 2
+            func(frame=4, **kwargs)
+        assert all(future.cancelled() for future in first)
+        assert len(executor.calls) == 4
+        assert not any(future.cancelled() for future, _, _ in executor.calls[2:])
+
+
+class TestDisplayPlotsIndex:
+    @staticmethod
+    def _touch(directory, *names):
+        for name in names:
+            with open(os.path.join(directory, name), 'w') as f:
+                f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+
+    def test_filebase_pattern(self):
+        from notutils.notutils import _filebase_pattern
+        pattern, names = _filebase_pattern('run_{run}.frame_{frame:03d}.png')
+        assert names == ['run', 'frame']
+        match = pattern.fullmatch('run_a.frame_007.png')
+        assert match.groupdict() == {'run': 'a', 'frame': '007'}
+        assert pattern.fullmatch('run_a.frame_007.svg') is None
+        assert pattern.fullmatch('run_aXframe_007.png') is None
+
+    def test_slider_ranges_inferred(self, tmp_path):
+        from ipywidgets import fixed
+        from notutils.notutils import _FrameIndex
+        self._touch(tmp_path, 'a_000.svg', 'a_005.svg', 'a_010.svg', 'b_000.svg',
+                    'c_005.svg', 'notes.txt', 'a_xyz.png')
+        frames = _FrameIndex('{run}_{frame:03d}.svg', str(tmp_path))
+        assert len(frames) == 5
+        assert 'a_005.svg' in frames
+        assert 'b_005.svg' not in frames
+        ranges = frames.slider_ranges()
+        assert ranges['frame'] == (0, 10, 5)
+        assert ranges['run'] == ['a', 'b', 'c']
+        single = _FrameIndex('a_{frame:03d}.svg', str(tmp_path)).slider_ranges()
+        assert single['frame'] == (0, 10, 5)
+        only = _FrameIndex('b_{frame:03d}.svg', str(tmp_path)).slider_ranges()
+        assert isinstance(only['frame'], fixed)
+
+    @patch('notutils.notutils.interact')
+    def test_empty_index_raises(self, mock_interact, tmp_path):
+        import re
+        self._touch(tmp_path, 'notes.txt')
+        plots = tmp_path / 'plots'
+        plots.mkdir()
+        with pytest.raises(ValueError, match=re.escape(str(plots))):
+            display_plots('plots/{run}_{frame:03d}.svg', directory=str(tmp_path), index=True)
+        mock_interact.assert_not_called()
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_missing_frames_skipped(self, mock_interact, mock_display, tmp_path):
+        from notutils import FrameCache
+        self._touch(tmp_path, 'a_000.svg', 'a_005.svg', 'b_000.svg')
+        cache = FrameCache()
+        display_plots('{run}_{frame:03d}.svg', directory=str(tmp_path), cache=cache,
+                      index=True, run=['b', 'a'])
+        kwargs = _interact_kwargs(mock_interact)
+        assert kwargs['run'] == ['b', 'a']
+        assert kwargs['frame'] == (0, 5, 5)
+        func = mock_interact.call_args[0][0]
+        kwargs.update(run='b', frame=5)
+        with patch('notutils.notutils.os.stat') as mock_stat:
+            func(**kwargs)
+        mock_stat.assert_not_called()
+        mock_display.assert_not_called()
+        kwargs.update(run='a', frame=5)
+        func(**kwargs)
+        mock_display.assert_called_once()
+        assert cache.misses == 1
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_float_field(self, mock_interact, mock_display, tmp_path):
+        """Values matched by a float format spec are looked up, not formatted again."""
+        from notutils import FrameCache
+        self._touch(tmp_path, 'p_0.5.svg', 'p_2.5.svg', 'p_10.0.svg')
+        display_plots('p_{x:.1f}.svg', directory=str(tmp_path), cache=FrameCache(), index=True)
+        kwargs = _interact_kwargs(mock_interact)
+        assert kwargs['x'] == ['0.5', '2.5', '10.0']
+        func = mock_interact.call_args[0][0]
+        for value in kwargs.pop('x'):
+            func(x=value, **kwargs)
+        assert mock_display.call_count == 3
+        # a value given by the caller is still formatted with the spec.
+        func(x=2.5, **kwargs)
+        assert mock_display.call_count == 4
+        func(x=1.0, **kwargs)
+        assert mock_display.call_count == 4
+
+
+class TestDisplayPlotsEmbed:
+    @staticmethod
+    def _write(directory, name, size=10):
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(b'\x89PNG' + b'\x00' * size)
+
+    @staticmethod
+    def _payload(html, name):
+        import json
+        import re
+        return json.loads(re.search(r'var {} = (.*);\n'.format(name), html).group(1))
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_embed_all_frames(self, mock_interact, mock_display, tmp_path):
+        import base64
+        from notutils import FrameCache
+        for run in ['a', 'b']:
+            for frame in range(3):
+                if (run, frame) != ('b', 2):
+                    self._write(tmp_path, '{}_{}.png'.format(run, frame))
+        display_plots('{run}_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                      mode='embed', run=['a', 'b'], frame=(0, 2), title='fixed')
+        mock_interact.assert_not_called()
+        mock_display.assert_called_once()
+        html = mock_display.call_args[0][0].data
+        frames = self._payload(html, 'frames')
+        dims = self._payload(html, 'dims')
+        assert dims == [['run', ['a', 'b']], ['frame', ['0', '1', '2']]]
+        assert len(frames) == 5
+        assert '1,2' not in frames
+        prefix = 'data:image/png;base64,'
+        assert frames['0,1'].startswith(prefix)
+        assert base64.b64decode(frames['0,1'][len(prefix):]).startswith(b'\x89PNG')
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_embed_size_cap_falls_back(self, mock_interact, mock_display, tmp_path):
+        from notutils import FrameCache
+        for frame in range(3):
+            self._write(tmp_path, 'f_{}.png'.format(frame), size=400 * 1024)
+        with pytest.warns(UserWarning, match='max_embed_mb'):
+            display_plots('f_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                          mode='embed', max_embed_mb=1, frame=(0, 2))
+        mock_interact.assert_called_once()
+
+    @patch('notutils.notutils.interact')
+    def test_embed_html_falls_back(self, mock_interact):
+        with pytest.warns(UserWarning):
+            display_plots('f_{frame}.html', mode='embed', frame=(0, 2))
+        mock_interact.assert_called_once()
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError):
+            display_plots('f_{frame}.png', mode='movie', frame=(0, 2))
+
+
+class TestDisplayPlotsAnimation:
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_animation_single_output(self, mock_interact, mock_display, tmp_path, write_frames):
+        import base64
+        import io
+        import re
+        from PIL import Image as PILImage
+        write_frames(tmp_path, num_frames=4, shape=(8, 8))
+        display_plots('frame_{frame}.png', directory=str(tmp_path), mode='animation',
+                      interval=100, frame=(0, 3))
+        mock_interact.assert_not_called()
+        mock_display.assert_called_once()
+        html = mock_display.call_args[0][0].data
+        match = re.search(r'src="data:(image/\w+);base64,([^"]+)"', html)
+        assert match.group(1) in ('image/webp', 'image/png')
+        with PILImage.open(io.BytesIO(base64.b64decode(match.group(2)))) as animation:
+            assert animation.n_frames == 4
+
+    @patch('notutils.notutils.interact')
+    def test_animation_without_encoder_falls_back(self, mock_interact, tmp_path, write_frames):
+        import sys
+        import matplotlib.animation
+        write_frames(tmp_path, num_frames=4, shape=(8, 8))
+        with patch.dict(sys.modules, {'PIL': None}), \
+                patch('matplotlib.animation.writers.is_available', return_value=False):
+            with pytest.warns(UserWarning, match='encoder'):
+                display_plots('frame_{frame}.png', directory=str(tmp_path),
+                              mode='animation', frame=(0, 3))
+        mock_interact.assert_called_once()
+
+    @patch('notutils.notutils.interact')
+    def test_animation_svg_falls_back(self, mock_interact):
+        with pytest.warns(UserWarning):
+            display_plots('frame_{frame}.svg', mode='animation', frame=(0, 3))
+        mock_interact.assert_called_once()
+
+    @patch('notutils.notutils.interact')
+    def test_animation_no_frames_falls_back(self, mock_interact, tmp_path):
+        with pytest.warns(UserWarning, match='No frames'):
+            display_plots('frame_{frame}.png', directory=str(tmp_path),
+                          mode='animation', frame=(0, 3))
+        mock_interact.assert_called_once()
+
+
+class TestDisplayPlotsThumbnails:
+    def test_thumbnail_cached_by_mtime_and_size(self, tmp_path, write_frames):
+        from PIL import Image as PILImage
+        from notutils.notutils import _thumbnail
+        write_frames(tmp_path, 1, shape=(300, 400))
+        path = os.path.join(tmp_path, 'frame_0.png')
+        thumbs = os.path.join(tmp_path, 'thumbs')
+        small = _thumbnail(path, 40, 30, thumbs)
+        assert os.path.dirname(small) == thumbs
+        with PILImage.open(small) as image:
+            assert image.size == (40, 30)
+            assert image.format == 'PNG'
+        assert _thumbnail(path, 40, 30, thumbs) == small
+        assert _thumbnail(path, 80, 60, thumbs) != small
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert _thumbnail(path, 40, 30, thumbs) != small
+        assert _thumbnail(path, 800, 600, thumbs) == path
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_display_plots_sends_thumbnails(self, mock_interact, mock_display, tmp_path,
+                                            write_frames):
+        import io
+        import time
+        from PIL import Image as PILImage
+        from notutils import FrameCache
+        write_frames(tmp_path, shape=(300, 400))
+        thumbs = os.path.join(tmp_path, 'thumbs')
+        display_plots('frame_{frame}.png', directory=str(tmp_path), width=40, height=30,
+                      cache=FrameCache(), thumbnails=True, thumbnail_dir=thumbs, frame=(0, 2))
+
+        def made():
+            if not os.path.exists(thumbs):
+                return 0
+            return len([f for f in os.listdir(thumbs) if f.endswith('.png')])
+
+        end = time.time() + 5
+        while time.time() < end and made() < 3:
+            time.sleep(0.01)
+        assert made() == 3
+        func = mock_interact.call_args[0][0]
+        kwargs = _interact_kwargs(mock_interact)
+        kwargs['frame'] = 1
+        func(**kwargs)
+        image = mock_display.call_args[0][0]
+        with PILImage.open(io.BytesIO(image.data)) as frame:
+            assert frame.size == (40, 30)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_thumbnails_made_in_parallel(self, mock_interact, mock_display, tmp_path,
+                                         write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path, num_frames=9, shape=(300, 400))
+        thumbs = os.path.join(tmp_path, 'thumbs')
+        executor = _ManualExecutor()
+        with patch('notutils.notutils._thumbnail_executor', return_value=executor):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), width=40, height=30,
+                          cache=FrameCache(), thumbnails=True, thumbnail_dir=thumbs,
+                          frame=(0, 8))
+        assert len(executor.calls) == 4
+        paths = [os.path.join(str(tmp_path), 'frame_{}.png'.format(frame)) for frame in (0, 4, 8)]
+        assert executor.calls[0][2] == (paths,)
+        for index in range(4):
+            executor.run(index)
+        assert len(os.listdir(thumbs)) == 9
+
+    def test_source_looked_up_once(self, tmp_path, write_frames):
+        from notutils import FrameCache
+        from notutils.notutils import _PlotFrames, _thumbnail
+        write_frames(tmp_path, num_frames=1, shape=(300, 400))
+        frames = _PlotFrames('frame_{frame}.png', str(tmp_path), 40, 30, FrameCache(),
+                             thumbnail_dir=os.path.join(tmp_path, 'thumbs'))
+        path = frames.frame_path(frame=0)
+        with patch('notutils.notutils._thumbnail', wraps=_thumbnail) as mock_thumbnail:
+            small = frames.source(path)
+            assert frames.source(path) == small
+            assert mock_thumbnail.call_count == 1
+            # a frame that changes on disk is downscaled again.
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+            assert frames.source(path) != small
+            assert mock_thumbnail.call_count == 2
+
+
+class _ManualExecutor:
+    """Executor that runs submitted calls only when asked to."""
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+        future = Future()
+        self.calls.append((future, fn, args))
+        return future
+
+    def run(self, index):
+        future, fn, args = self.calls[index]
+        if future.set_running_or_notify_cancel():
+            future.set_result(fn(*args))
+
+
+class TestDisplayPlotsAsync:
+    @patch('notutils.notutils.display')
+    def test_async_updates_image_widget(self, mock_display, tmp_path, write_frames):
+        import ipywidgets
+        from notutils import FrameCache
+        write_frames(tmp_path)
+        executor = _ManualExecutor()
+        with patch('notutils.notutils._display_executor', return_value=executor):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                          mode='async', frame=(0, 2))
+            box = mock_display.call_args[0][0]
+            slider, view = box.children
+            assert isinstance(view, ipywidgets.Image)
+            assert view.format == 'png'
+            assert len(executor.calls) == 1
+            executor.run(0)
+            assert view.value == b'\x89PNG frame 1'
+
+            slider.value = 2
+            slider.value = 0
+            # the load for frame 2 hadn't started, so it is cancelled.
+            assert executor.calls[1][0].cancelled()
+            executor.run(2)
+            executor.run(1)
+            assert view.value == b'\x89PNG frame 0'
+
+    @patch('notutils.notutils.display')
+    def test_async_load_not_queued_behind_background_jobs(self, mock_display, tmp_path,
+                                                          write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path, num_frames=4, shape=(300, 400))
+        background = _ManualExecutor()
+        thumbnails = _ManualExecutor()
+        executor = _ManualExecutor()
+        with patch('notutils.notutils._background_executor', return_value=background), \
+                patch('notutils.notutils._thumbnail_executor', return_value=thumbnails), \
+                patch('notutils.notutils._display_executor', return_value=executor):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                          width=40, height=30, thumbnails=True,
+                          thumbnail_dir=str(tmp_path / 'thumbs'), mode='async', frame=(0, 3))
+            view = mock_display.call_args[0][0].children[-1]
+            # the series is downscaled on its own pool.
+            assert len(thumbnails.calls) == 4
+            assert background.calls == []
+            executor.run(0)
+        assert bytes(view.value).startswith(b'\x89PNG')
+
+    @patch('notutils.notutils.display')
+    def test_async_discards_stale_loads(self, mock_display, tmp_path, write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path)
+        executor = _ManualExecutor()
+        with patch('notutils.notutils._display_executor', return_value=executor):
+            display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                          mode='async', frame=(0, 2))
+            slider, view = mock_display.call_args[0][0].children
+            future, fn, args = executor.calls[0]
+            future.set_running_or_notify_cancel()
+            slider.value = 2
+            executor.run(1)
+            # the first load finishes after the slider moved on.
+            future.set_result(fn(*args))
+            assert view.value == b'\x89PNG frame 2'
+
+    @patch('notutils.notutils.display')
+    def test_async_svg_uses_html_widget(self, mock_display, tmp_path):
+        import ipywidgets
+        from notutils import FrameCache, EventCounter
+        with open(os.path.join(tmp_path, 'plot_0.svg'), 'w') as f:
+            f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+        counter = EventCounter()
+        executor = _ManualExecutor()
+        with patch('notutils.notutils._display_executor', return_value=executor):
+            display_plots('plot_{frame}.svg', directory=str(tmp_path), cache=FrameCache(),
+                          mode='async', counter=counter, frame=(0, 0, 1))
+            view = mock_display.call_args[0][0].children[-1]
+            executor.run(0)
+        assert isinstance(view, ipywidgets.HTML)
+        assert view.value.startswith('<svg')
+        assert counter.events == 1
+
+
+class TestDisplayPlotsWidget:
+    @patch('notutils.notutils.display')
+    def test_widget_value_swapped_in_place(self, mock_display, tmp_path, write_frames):
+        import ipywidgets
+        from notutils import FrameCache, EventCounter
+        write_frames(tmp_path)
+        counter = EventCounter()
+        display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                      mode='widget', counter=counter, frame=(0, 2))
+        assert mock_display.call_count == 1
+        slider, view = mock_display.call_args[0][0].children
+        assert isinstance(view, ipywidgets.Image)
+        assert view.value == b'\x89PNG frame 1'
+        slider.value = 2
+        assert view.value == b'\x89PNG frame 2'
+        # the frame is swapped without displaying anything new.
+        assert mock_display.call_count == 1
+        assert counter.events == 2
+
+    @patch('notutils.notutils.display')
+    def test_widget_sliders_labelled_and_rate_limited(self, mock_display, tmp_path, write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path)
+        display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                      mode='widget', continuous_update=False, frame=(0, 2))
+        slider, view = mock_display.call_args[0][0].children
+        assert slider.description == 'frame'
+        assert slider.continuous_update is False
+
+    @patch('notutils.notutils.display')
+    def test_widget_manual(self, mock_display, tmp_path, write_frames):
+        import ipywidgets
+        from notutils import FrameCache
+        write_frames(tmp_path)
+        display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                      mode='widget', manual=True, frame=(0, 2))
+        slider, button, view = mock_display.call_args[0][0].children
+        assert isinstance(button, ipywidgets.Button)
+        assert view.value == b''
+        slider.value = 2
+        assert view.value == b''
+        button.click()
+        assert view.value == b'\x89PNG frame 2'
+
+    @patch('notutils.notutils.display')
+    def test_widget_keeps_last_frame_on_missing_file(self, mock_display, tmp_path, write_frames):
+        from notutils import FrameCache
+        write_frames(tmp_path, num_frames=2)
+        display_plots('frame_{frame}.png', directory=str(tmp_path), cache=FrameCache(),
+                      mode='widget', frame=(0, 2))
+        slider, view = mock_display.call_args[0][0].children
+        slider.value = 0
+        slider.value = 2
+        assert view.value == b'\x89PNG frame 0'
+
+
+class TestDisplayPlotsStore:
+    @staticmethod
+    def _pack(tmp_path, write_frames):
+        from notutils import pack_frames
+        frames = tmp_path / 'frames'
+        frames.mkdir()
+        write_frames(frames, num_frames=2)
+        output = str(tmp_path / 'frames.pack')
+        pack_frames('frame_{frame}.png', output, directory=str(frames))
+        # the store is read without touching the separate files.
+        for name in os.listdir(frames):
+            os.remove(os.path.join(frames, name))
+        return str(frames), output
+
+    @patch('notutils.notutils.display')
+    def test_store_frames_displayed(self, mock_display, tmp_path, write_frames):
+        from notutils import FrameCache
+        directory, output = self._pack(tmp_path, write_frames)
+        cache = FrameCache()
+        display_plots('frame_{frame}.png', directory=directory, store=output, cache=cache,
+                      index=True, mode='widget')
+        slider, view = mock_display.call_args[0][0].children
+        assert (slider.min, slider.max) == (0, 1)
+        assert view.value == b'\x89PNG frame 0'
+        slider.value = 1
+        assert view.value == b'\x89PNG frame 1'
+        assert len(cache) == 0
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.Image')
+    @patch('notutils.notutils.interact')
+    def test_store_skips_missing_frames(self, mock_interact, mock_image, mock_display, tmp_path,
+                                        write_frames):
+        from notutils import FrameStore
+        directory, output = self._pack(tmp_path, write_frames)
+        with FrameStore(output) as store:
+            display_plots('frame_{frame}.png', directory=directory, store=store, frame=(0, 3))
+            func = mock_interact.call_args[0][0]
+            func(filebase='frame_{frame}.png', directory=directory, frame=1)
+            assert mock_image.call_args[1]['data'] == b'\x89PNG frame 1'
+            mock_image.reset_mock()
+            func(filebase='frame_{frame}.png', directory=directory, frame=3)
+            mock_image.assert_not_called()
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_store_opened_from_path_closed(self, mock_interact, mock_display, tmp_path,
+                                           write_frames):
+        import gc
+        from notutils import FrameStore
+        directory, output = self._pack(tmp_path, write_frames)
+        with patch.object(FrameStore, 'close', autospec=True) as mock_close:
+            display_plots('frame_{frame}.png', directory=directory, store=output, frame=(0, 1))
+            mock_close.assert_not_called()
+            # dropping the widget releases the frames and unmaps the store.
+            mock_interact.reset_mock()
+            gc.collect()
+            mock_close.assert_called_once()
+
+
+class TestDisplayPlotsFilenames:
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.Image')
+    @patch('notutils.notutils.interact')
+    def test_braces_in_directory(self, mock_interact, mock_image, mock_display, tmp_path,
+                                 write_frames):
+        """Braces in the directory aren't treated as format fields."""
+        from notutils import FrameCache
+        directory = tmp_path / 'run_{seed}'
+        directory.mkdir()
+        write_frames(directory, num_frames=1)
+        display_plots('frame_{frame}.png', directory=str(directory), cache=FrameCache(), frame=0)
+        func = mock_interact.call_args[0][0]
+        func(filebase='frame_{frame}.png', directory=str(directory), frame=0)
+        assert mock_image.call_args[1]['data'] == b'\x89PNG frame 0'
+        assert mock_image.call_args[1]['format'] == 'png'
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.IFrame')
+    @patch('notutils.notutils.interact')
+    def test_upper_case_extension(self, mock_interact, mock_iframe, mock_display):
+        """The extension is matched regardless of case."""
+        display_plots('page_{n}.HTML', directory='pages', width=300, height=200, n=0)
+        func = mock_interact.call_args[0][0]
+        func(filebase='page_{n}.HTML', directory='pages', width=300, height=200, n=2)
+        mock_iframe.assert_called_once_with(src='pages/page_2.HTML', width=300, height=200)
+        mock_display.assert_called_once_with(mock_iframe.return_value)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_unknown_extension_not_displayed(self, mock_interact, mock_display):
+        """Files of an unknown type are skipped without locating the frame."""
+        from notutils import FrameCache
+        from notutils.notutils import _PlotFrames
+        frames = _PlotFrames('data_{n}.txt', None, 300, 200, FrameCache())
+        assert frames.render is None
+        display_plots('data_{n}.txt', n=0)
+        func = mock_interact.call_args[0][0]
+        with patch.object(_PlotFrames, 'locate') as mock_locate:
+            func(filebase='data_{n}.txt', directory=None, n=1)
+        mock_locate.assert_not_called()
+        mock_display.assert_not_called()
@@ -4,6 +4,7 @@ Unit tests for display_prediction function.
 import pytest
 import numpy as np
 from unittest.mock import patch, MagicMock
+from ipywidgets import fixed
 from notutils import display_prediction
 
 
@@ -231,4 +232,394 @@ class TestDisplayPredictionFullCoverage:
             return np.ones((x.shape[0], num_basis))
         display_prediction(mock_basis, fig=mock_fig, ax=mock_ax, xlim=(-5, 5), ylim=(-3, 3))
         mock_interact.assert_called()
-        # display may not be called in this branch 
\ No newline at end of file
+        # display may not be called in this branch 
+
+def _call_with_values(func, kwargs, **values):
+    """Call an interact callback with the fixed values unwrapped."""
+    args = {key: val.value if isinstance(val, fixed) else val
+            for key, val in kwargs.items()}
+    for key in list(args):
+        if key.startswith('w_'):
+            args[key] = 0.0
+    args['display_basis'] = True
+    args.update(values)
+    return func(**args)
+
+
+class TestDisplayPredictionBlit:
+    @staticmethod
+    def _basis(x, num_basis, **kwargs):
+        return np.hstack([x ** i for i in range(num_basis)])
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_blit_caches_background(self, mock_interact, mock_display):
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots()
+        display_prediction(self._basis, fig=fig, ax=ax, redraw='blit')
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        with patch.object(fig.canvas, 'draw', wraps=fig.canvas.draw) as mock_draw:
+            _call_with_values(func, kwargs, w_0=0.5)
+            _call_with_values(func, kwargs, w_1=-0.5)
+            assert mock_draw.call_count == 1
+        images = [call[0][0] for call in mock_display.call_args_list]
+        assert len(images) == 2
+        for image in images:
+            assert image.data.startswith(b'\x89PNG')
+        assert images[0].data != images[1].data
+        plt.close(fig)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_blit_with_closed_pyplot_figure(self, mock_interact, mock_display):
+        display_prediction(self._basis, redraw='blit')
+        func = mock_interact.call_args[0][0]
+        _call_with_values(func, mock_interact.call_args[1], w_0=0.5)
+        image = mock_display.call_args[0][0]
+        assert image.data.startswith(b'\x89PNG')
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_blit_falls_back_without_agg_canvas(self, mock_interact, mock_display):
+        mock_fig = MagicMock()
+        mock_ax = MagicMock()
+        mock_ax.get_xlim.return_value = (-2.0, 2.0)
+        mock_ax.get_ylim.return_value = (-1.0, 1.0)
+        mock_ax.plot.return_value = [MagicMock()]
+        display_prediction(self._basis, fig=mock_fig, ax=mock_ax, redraw='blit')
+        func = mock_interact.call_args[0][0]
+        _call_with_values(func, mock_interact.call_args[1])
+        mock_display.assert_called_once_with(mock_fig)
+
+    def test_invalid_redraw(self):
+        with pytest.raises(ValueError):
+            display_prediction(self._basis, redraw='fast')
+
+
+class TestDisplayPredictionBasisCache:
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_basis_evaluated_once_per_basis(self, mock_close, mock_interact, mock_display):
+        calls = {'poly': 0, 'rbf': 0}
+
+        def poly(x, num_basis, **kwargs):
+            calls['poly'] += 1
+            return np.hstack([x ** i for i in range(num_basis)])
+
+        def rbf(x, num_basis, **kwargs):
+            calls['rbf'] += 1
+            centres = np.linspace(-1, 1, num_basis)
+            return np.exp(-(x - centres) ** 2)
+
+        display_prediction({'poly': poly, 'rbf': rbf}, num_points=50)
+        assert calls == {'poly': 1, 'rbf': 0}
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        for w in [0.1, 0.2, 0.3]:
+            _call_with_values(func, kwargs, basis=poly, w_0=w)
+        assert calls == {'poly': 1, 'rbf': 0}
+        _call_with_values(func, kwargs, basis=rbf)
+        _call_with_values(func, kwargs, basis=rbf, w_1=0.5)
+        _call_with_values(func, kwargs, basis=poly)
+        assert calls == {'poly': 1, 'rbf': 1}
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_prediction_uses_cached_basis(self, mock_close, mock_interact, mock_display):
+        def poly(x, num_basis, **kwargs):
+            return np.hstack([x ** i for i in range(num_basis)])
+
+        display_prediction(poly, num_basis=2, num_points=5, xlim=(0.0, 1.0))
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        predline = MagicMock()
+        _call_with_values(func, kwargs, predline=predline, w_0=1.0, w_1=2.0)
+        f = predline.set_ydata.call_args[0][0]
+        expected = 1.0 + 2.0 * np.linspace(0.0, 1.0, 5)
+        np.testing.assert_allclose(np.ravel(f), expected)
+
+
+class TestDisplayPredictionIncremental:
+    @staticmethod
+    def _basis(x, num_basis, **kwargs):
+        return np.hstack([x ** i for i in range(num_basis)])
+
+    def _widget(self, mock_interact, **kwargs):
+        display_prediction(self._basis, num_points=11, xlim=(-1.0, 1.0), **kwargs)
+        func = mock_interact.call_args[0][0]
+        interact_kwargs = mock_interact.call_args[1]
+        predline = MagicMock()
+        basislines = [MagicMock() for _ in range(4)]
+        interact_kwargs['predline'] = predline
+        interact_kwargs['basislines'] = basislines
+        return func, interact_kwargs, predline, basislines
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_weight_change_only_updates_prediction(self, mock_close, mock_interact, mock_display):
+        func, kwargs, predline, basislines = self._widget(mock_interact)
+        _call_with_values(func, kwargs)
+        for line in [predline] + basislines:
+            line.reset_mock()
+        _call_with_values(func, kwargs, w_2=0.5)
+        predline.set_ydata.assert_called_once()
+        predline.set_xdata.assert_not_called()
+        for line in basislines:
+            line.set_xdata.assert_not_called()
+            line.set_ydata.assert_not_called()
+            line.set_alpha.assert_not_called()
+        x = np.linspace(-1.0, 1.0, 11)
+        np.testing.assert_allclose(np.ravel(predline.set_ydata.call_args[0][0]), 0.5 * x ** 2)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_display_basis_toggle_only_updates_alpha(self, mock_close, mock_interact, mock_display):
+        func, kwargs, predline, basislines = self._widget(mock_interact)
+        _call_with_values(func, kwargs, display_basis=True)
+        for line in [predline] + basislines:
+            line.reset_mock()
+        _call_with_values(func, kwargs, display_basis=False)
+        predline.set_ydata.assert_not_called()
+        for line in basislines:
+            line.set_ydata.assert_not_called()
+            line.set_alpha.assert_called_once_with(0)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_unchanged_event_touches_no_artists(self, mock_close, mock_interact, mock_display):
+        func, kwargs, predline, basislines = self._widget(mock_interact)
+        _call_with_values(func, kwargs, w_1=0.3)
+        for line in [predline] + basislines:
+            line.reset_mock()
+        _call_with_values(func, kwargs, w_1=0.3)
+        for line in [predline] + basislines:
+            assert line.method_calls == []
+        mock_display.assert_called()
+
+
+class TestDisplayPredictionRateLimiting:
+    @staticmethod
+    def _basis(x, num_basis, **kwargs):
+        return np.ones((x.shape[0], num_basis))
+
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_no_continuous_update_sliders(self, mock_close, mock_interact):
+        display_prediction(self._basis, continuous_update=False)
+        kwargs = mock_interact.call_args[1]
+        for i in range(4):
+            slider = kwargs['w_' + str(i)]
+            assert slider.continuous_update is False
+        assert isinstance(kwargs['basis'], fixed)
+
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_manual_update(self, mock_close, mock_interact):
+        display_prediction(self._basis, manual=True)
+        mock_interact.options.assert_called_once_with(manual=True)
+        mock_interact.options.return_value.assert_called_once()
+        mock_interact.assert_not_called()
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_counter_counts_events(self, mock_close, mock_interact, mock_display):
+        from notutils import EventCounter
+        counter = EventCounter()
+        display_prediction(self._basis, counter=counter)
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        for w in np.linspace(-1, 1, 5):
+            _call_with_values(func, kwargs, w_0=w)
+        assert counter.events == 5
+        counter.reset()
+        assert counter.events == 0
+
+
+class TestDisplayPredictionClient:
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.subplots')
+    def test_client_ships_basis_once(self, mock_subplots, mock_interact, mock_display):
+        import json
+        import re
+
+        def poly(x, num_basis, **kwargs):
+            return np.hstack([x ** i for i in range(num_basis)])
+
+        display_prediction({'poly': poly, 'const': lambda x, n: np.ones((x.shape[0], n))},
+                           num_basis=3, num_points=7, redraw='client')
+        mock_interact.assert_not_called()
+        mock_subplots.assert_not_called()
+        mock_display.assert_called_once()
+        html = mock_display.call_args[0][0].data
+        assert 'createElement("canvas")' in html
+        assert 'notutils-fallback' in html
+        data = json.loads(re.search(r'var data = (.*);\n', html).group(1))
+        assert len(data['x']) == 7
+        assert set(data['bases']) == {'poly', 'const'}
+        assert np.array(data['bases']['poly']).shape == (3, 7)
+        np.testing.assert_allclose(data['bases']['poly'][1], data['x'])
+        assert len(data['wlims']) == 3
+
+
+class TestDisplayPredictionWeightSamples:
+    @staticmethod
+    def _poly(x, num_basis, **kwargs):
+        return np.hstack([x ** i for i in range(num_basis)])
+
+    @staticmethod
+    def _const(x, num_basis, **kwargs):
+        return np.ones((x.shape[0], num_basis))
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_samples_drawn_as_one_collection(self, mock_interact, mock_display):
+        import matplotlib.pyplot as plt
+        from matplotlib.collections import LineCollection
+        fig, ax = plt.subplots()
+        W = np.random.RandomState(0).randn(3, 50)
+        display_prediction({'poly': self._poly, 'const': self._const}, num_basis=3,
+                           num_points=20, fig=fig, ax=ax, xlim=(-1.0, 1.0),
+                           weight_samples=W)
+        collections = [c for c in ax.collections if isinstance(c, LineCollection)]
+        assert len(collections) == 1
+        assert len(ax.lines) == 4
+        segments = collections[0].get_segments()
+        assert len(segments) == 50
+        x = np.linspace(-1.0, 1.0, 20)
+        np.testing.assert_allclose(segments[7][:, 1], self._poly(x[:, None], 3) @ W[:, 7])
+
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        _call_with_values(func, kwargs, basis=self._const)
+        segments = collections[0].get_segments()
+        np.testing.assert_allclose(segments[7][:, 1], np.full(20, W[:, 7].sum()))
+        plt.close(fig)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_blit_draws_samples_into_background(self, mock_interact, mock_display):
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots()
+        W = np.random.RandomState(0).randn(3, 200)
+        display_prediction({'poly': self._poly, 'const': self._const}, num_basis=3,
+                           fig=fig, ax=ax, weight_samples=W, redraw='blit')
+        assert not ax.collections[0].get_animated()
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        with patch.object(fig.canvas, 'draw', wraps=fig.canvas.draw) as mock_draw:
+            _call_with_values(func, kwargs, basis=self._poly, w_0=0.5)
+            _call_with_values(func, kwargs, basis=self._poly, w_1=-0.5)
+            assert mock_draw.call_count == 1
+            # new samples are drawn into a new background.
+            _call_with_values(func, kwargs, basis=self._const, w_1=-0.5)
+            assert mock_draw.call_count == 2
+        plt.close(fig)
+
+    def test_samples_shape_checked(self):
+        with pytest.raises(ValueError):
+            display_prediction(self._poly, num_basis=3, weight_samples=np.zeros((2, 5)))
+
+
+class TestDisplayPredictionDecimate:
+    @staticmethod
+    def _basis(x, num_basis, **kwargs):
+        return np.hstack([np.sin((i + 1) * 20 * x) for i in range(num_basis)])
+
+    def test_minmax_decimate(self):
+        from notutils.notutils import _minmax_decimate
+        x = np.linspace(0.0, 1.0, 10001)
+        y = np.sin(200 * x)
+        xd, yd = _minmax_decimate(x, y, (0.0, 1.0), 100)
+        assert xd.shape == (200,)
+        assert yd.shape == (200,)
+        np.testing.assert_allclose(yd.max(), y.max())
+        np.testing.assert_allclose(yd.min(), y.min())
+        assert np.all(np.diff(xd) >= 0)
+        xd, yd = _minmax_decimate(x, np.c_[y, -y], (0.0, 0.5), 100)
+        assert yd.shape == (200, 2)
+        assert xd.max() <= 0.5
+        xd, yd = _minmax_decimate(x[:50], y[:50], (0.0, 1.0), 100)
+        assert xd.shape == (50,)
+
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    def test_lines_bounded_by_axes_width(self, mock_interact, mock_display):
+        import matplotlib.pyplot as plt
+        fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+        display_prediction(self._basis, num_points=100000, fig=fig, ax=ax,
+                           xlim=(-1.0, 1.0), decimate=True)
+        width = int(ax.bbox.width)
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        _call_with_values(func, kwargs, w_0=0.7)
+        for line in ax.lines:
+            assert len(line.get_xdata()) <= 2 * width
+        predline = ax.lines[0]
+        np.testing.assert_allclose(np.max(predline.get_ydata()), 0.7, rtol=1e-3)
+
+        ax.set_xlim(0.0, 0.5)
+        xdata = predline.get_xdata()
+        assert len(xdata) <= 2 * width
+        assert xdata.min() >= 0.0
+        assert xdata.max() <= 0.5
+        plt.close(fig)
+
+
+class TestDisplayPredictionMemory:
+    @patch('notutils.notutils.display')
+    @patch('notutils.notutils.interact')
+    @patch('matplotlib.pyplot.close')
+    def test_float32_buffers(self, mock_close, mock_interact, mock_display):
+        seen = {}
+
+        def basis(x, num_basis, **kwargs):
+            seen['x'] = x
+            return np.hstack([x ** i for i in range(num_basis)])
+
+        display_prediction(basis, num_points=100, dtype='float32')
+        x = seen['x']
+        assert x.shape == (100, 1)
+        assert x.dtype == np.float32
+        assert x.base is not None and x.base.flags['C_CONTIGUOUS']
+        func = mock_interact.call_args[0][0]
+        kwargs = mock_interact.call_args[1]
+        predline = MagicMock()
+        basislines = [MagicMock() for _ in range(4)]
+        _call_with_values(func, kwargs, predline=predline, basislines=basislines, w_1=0.5)
+        assert predline.set_ydata.call_args[0][0].dtype == np.float32
+        phi = basislines[1].set_ydata.call_args[0][0]
+        assert phi.dtype == np.float32
+
+    def test_cache_released_on_close(self):
+        import ipywidgets
+        calls = []
+
+        def basis(x, num_basis, **kwargs):
+            calls.append(1)
+            return np.ones((x.shape[0], num_basis))
+
+        captured = {}
+        real_interact = ipywidgets.interact
+
+        def fake_interact(func, **kwargs):
+            captured['func'] = func
+            captured['kwargs'] = kwargs
+            result = real_interact(func, **kwargs)
+            captured['widget'] = result.widget
+            return result
+
+        with patch('notutils.notutils.interact', side_effect=fake_interact), \
+                patch('notutils.notutils.display'), patch('matplotlib.pyplot.close'):
+            display_prediction(basis, num_points=10)
+            assert len(calls) == 1
+            captured['widget'].close()
+            _call_with_values(captured['func'], captured['kwargs'])
+            assert len(calls) == 2
@@ -0,0 +1,46 @@
+"""
+Unit tests for iter_urls and display_urls functions.
+"""
+from unittest.mock import patch
+from notutils import display_urls, iter_urls
+
+
+class TestIterUrls:
+    """Test cases for iter_urls function."""
+
+    def test_iter_urls_separated(self):
+        html = "".join(iter_urls(["www.example.com", "https://example.org"]))
+        assert html == (
+            '<a href="http://www.example.com" target=_blank>http://www.example.com</a><br>\n'
+            '<a href="https://example.org" target=_blank>https://example.org</a>'
+        )
+
+    def test_iter_urls_link_text(self):
+        html = "".join(iter_urls([("https://example.org", {"text": "Example"})]))
+        assert html == '<a href="https://example.org" target=_blank>Example</a>'
+
+    def test_iter_urls_is_lazy(self):
+        def targets():
+            yield "https://example.org"
+            raise AssertionError("read too far ahead")
+
+        pieces = iter_urls(targets())
+        assert next(pieces).startswith('<a href="https://example.org"')
+
+    def test_iter_urls_empty(self):
+        assert list(iter_urls([])) == []
+
+
+class TestDisplayUrls:
+    """Test cases for display_urls function."""
+
+    @patch('notutils.notutils.display')
+    def test_display_urls_single_output(self, mock_display):
+        targets = ["site{}.example.com".format(n) for n in range(100)]
+        display_urls(targets, separator=" ")
+        mock_display.assert_called_once()
+        html_str = mock_display.call_args[0][0].data
+        assert html_str.count('<a href=') == 100
+        assert html_str == " ".join(
+            '<a href="http://{t}" target=_blank>http://{t}</a>'.format(t=t) for t in targets
+        )
@@ -2,7 +2,7 @@
 Unit tests for iframe_url function.
 """
 import pytest
-from notutils import iframe_url
+from notutils import IframeTemplate, iframe_url
 
 
 class TestIframeUrl:
@@ -98,4 +98,75 @@ class TestIframeUrl:
         result = iframe_url(url)
         
         assert url in result
-        assert "iframe" in result 
\ No newline at end of file
+        assert "iframe" in result 
+
+
+class TestIframeTemplate:
+    """Test cases for IframeTemplate class."""
+
+    def test_iframe_template_matches_iframe_url(self):
+        """Test the template renders the same markup as iframe_url."""
+        template = IframeTemplate(width=800, height=200, scrolling=False, border=1, frameborder=2)
+        for url in ["https://www.example.com", "www.example.com"]:
+            assert template.render(url) == iframe_url(
+                url, width=800, height=200, scrolling=False, border=1, frameborder=2
+            )
+            assert template(url) == template.render(url)
+
+    def test_iframe_template_exact_markup(self):
+        """Test the rendered markup is unchanged from the formatted version."""
+        assert IframeTemplate().render("example.com") == (
+            '<iframe frameborder="0" scrolling="yes" style="border:0px" '
+            'src="http://example.com", width=500 height=400></iframe>'
+        )
+
+    def test_iframe_url_reuses_template(self):
+        """Test iframe_url keeps one template per configuration."""
+        from notutils.notutils import _iframe_template
+        iframe_url("https://a.example.com", width=123)
+        iframe_url("https://b.example.com", width=123)
+        assert _iframe_template(123, 400, True, 0, 0, None) is _iframe_template(123, 400, True, 0, 0, None)
+
+
+class TestIframeUrlLoading:
+    """Test cases for the lazy loading modes of iframe_url."""
+
+    def test_iframe_url_default_loads_immediately(self):
+        """Test no loading attribute is added by default."""
+        assert 'loading=' not in iframe_url("https://www.example.com")
+
+    def test_iframe_url_lazy(self):
+        """Test native lazy loading adds the attribute to the iframe."""
+        result = iframe_url("https://www.example.com", loading="lazy")
+        assert result.startswith("<iframe")
+        assert 'loading="lazy"' in result
+        assert 'src="https://www.example.com"' in result
+
+    def test_iframe_url_placeholder(self):
+        """Test the placeholder holds the escaped iframe until it's loaded."""
+        import html
+        url = "https://www.example.com/?a=1&b=2"
+        result = iframe_url(url, width=300, height="50%", loading="placeholder")
+        assert not result.startswith("<iframe")
+        assert 'class="notutils-iframe"' in result
+        assert "width:300px;height:50%" in result
+        assert "IntersectionObserver" in result
+        assert 'addEventListener("click"' in result
+        data = result.split('data-iframe="', 1)[1].split('"', 1)[0]
+        assert html.unescape(data) == iframe_url(url, width=300, height="50%")
+
+    def test_iframe_template_placeholder_script_separate(self):
+        """Test the template leaves the loading script to the caller."""
+        template = IframeTemplate(loading="placeholder")
+        assert "<script>" not in template.render("https://www.example.com")
+        assert "<script>" in template.script
+        assert iframe_url("https://www.example.com", loading="placeholder") == (
+            template.render("https://www.example.com") + template.script
+        )
+        assert IframeTemplate(loading="lazy").script == ""
+
+    def test_iframe_url_invalid_loading(self):
+        """Test unknown loading modes are rejected."""
+        with pytest.raises(ValueError):
+            iframe_url("https://www.example.com", loading="later")
+
@@ -0,0 +1,52 @@
+"""
+Unit tests for the lazy loading of IPython and plotting dependencies.
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import notutils
+import notutils.notutils as nu
+
+
+class TestLazyImports:
+    """Test cases for importing notutils without its heavy dependencies."""
+
+    def test_import_does_not_load_widgets_or_plotting(self):
+        code = (
+            "import sys\n"
+            "import notutils\n"
+            "html = notutils.iframe_url('example.com')\n"
+            "assert html.startswith('<iframe')\n"
+            "loaded = [name for name in ('IPython', 'ipywidgets', 'matplotlib', 'numpy')"
+            " if name in sys.modules]\n"
+            "print(','.join(loaded))\n"
+        )
+        # run from the repository root so the package imports from any directory.
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root
+        )
+        assert result.stdout.strip() == ""
+
+    def test_ipython_names_loaded_on_access(self):
+        from IPython.display import display
+        assert nu.display is display
+        assert nu.fixed.__name__ == "fixed"
+
+    def test_ipython_names_on_package(self):
+        from IPython.display import display
+        assert notutils.display is display
+        assert notutils.fixed is nu.fixed
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            nu.not_a_function
+        with pytest.raises(AttributeError):
+            notutils.not_a_function
+
+    def test_public_names(self):
+        for name in nu.__all__:
+            assert getattr(notutils, name) is getattr(nu, name)
@@ -0,0 +1,69 @@
+"""
+Unit tests for pack_frames and FrameStore.
+"""
+import os
+
+import pytest
+
+from notutils import FrameStore, pack_frames
+
+
+class TestPackFrames:
+    """Test cases for packing frames into a single file."""
+
+    def test_round_trip(self, tmp_path, write_frames):
+        """Every matching frame reads back unchanged from the store."""
+        write_frames(tmp_path)
+        (tmp_path / 'notes.txt').write_text('not a frame')
+        output = str(tmp_path / 'frames.pack')
+        assert pack_frames('frame_{frame}.png', output, directory=str(tmp_path)) == 3
+        with FrameStore(output) as store:
+            assert len(store) == 3
+            assert store.files == {'frame_0.png', 'frame_1.png', 'frame_2.png'}
+            assert 'notes.txt' not in store
+            for frame in range(3):
+                name = 'frame_{}.png'.format(frame)
+                with open(os.path.join(tmp_path, name), 'rb') as f:
+                    assert bytes(store.read(name)) == f.read()
+
+    def test_read_is_a_view(self, tmp_path, write_frames):
+        """Frames are returned as views of the mapped file."""
+        write_frames(tmp_path, num_frames=1)
+        output = str(tmp_path / 'frames.pack')
+        pack_frames('frame_{frame}.png', output, directory=str(tmp_path))
+        store = FrameStore(output)
+        view = store.read('frame_0.png')
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        view.release()
+        store.close()
+
+    def test_subdirectory_in_filebase(self, tmp_path, write_frames):
+        """Frames in a subdirectory named by the filebase keep their relative names."""
+        (tmp_path / 'plots').mkdir()
+        write_frames(tmp_path / 'plots', num_frames=2)
+        output = str(tmp_path / 'frames.pack')
+        pack_frames('plots/frame_{frame}.png', output, directory=str(tmp_path))
+        with FrameStore(output) as store:
+            assert store.files == {'plots/frame_0.png', 'plots/frame_1.png'}
+
+    def test_not_a_store(self, tmp_path):
+        """Files without the store header are rejected."""
+        path = tmp_path / 'frame_0.png'
+        path.write_bytes(b'\x89PNG not packed at all')
+        with pytest.raises(ValueError):
+            FrameStore(str(path))
+
+    @pytest.mark.parametrize('cut', [0, 4, 12, 20, -3])
+    def test_truncated_store(self, tmp_path, write_frames, cut):
+        """Short or truncated files raise ValueError."""
+        write_frames(tmp_path, num_frames=2)
+        output = str(tmp_path / 'frames.pack')
+        pack_frames('frame_{frame}.png', output, directory=str(tmp_path))
+        with open(output, 'rb') as f:
+            data = f.read()
+        with open(output, 'wb') as f:
+            f.write(data[:cut])
+        with pytest.raises(ValueError):
+            FrameStore(output)
+